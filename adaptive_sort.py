@@ -0,0 +1,255 @@
+"""
+Adaptive sort dispatcher.
+
+`sort(numbers)` picks the sorting engine from the shape of the input instead of leaving the choice to the
+caller. A cheap probe looks at a fixed-size random sample of the input, so it costs the same for any input
+size, and estimates
+
+    Descent Ratio    the fraction of adjacent pairs that are out of order (the number of runs / n),
+    Inversion Ratio  the fraction of pairs that are out of order,
+    Distinct Ratio   the fraction of distinct values,
+    Range Ratio      the value range relative to the size, range / (range + n),
+    Integer Ratio    the fraction of integer values, which counting and radix sort need.
+
+Input that is sorted or reverse sorted is detected with an early-exit scan, which stops within a few values
+on unsorted input, and is then returned as is or reversed without running a sort. Everything else is
+dispatched to the engine of the nearest exemplar in the dispatch policy. `train_policy` builds the policy by timing every engine on the dataset shapes of
+datasets.py; `save_policy` and `load_policy` keep it as JSON. Every decision is logged to the
+"adaptive_sort" logger at INFO level for auditing.
+"""
+import json
+import logging
+import math
+import random
+import statistics
+import time
+
+from merge_sort import merge_sort
+from quicksort import quicksort
+from radix_sort import counting_sort, radix_sort
+from shell_sort import shell_sort
+
+logger = logging.getLogger(__name__)
+
+FEATURE_NAMES = ["Descent Ratio", "Inversion Ratio", "Distinct Ratio", "Range Ratio", "Integer Ratio"]
+ADJACENT_SAMPLES = 256
+INVERSION_SAMPLES = 64
+DISTINCT_SAMPLES = 256
+
+# The engines the dispatcher chooses between. All of them sort in-place without swap counting.
+ENGINES = {
+    "Shell Sort": lambda numbers: shell_sort(numbers, count=False),
+    "QuickSort": lambda numbers: quicksort(numbers, 0, len(numbers) - 1, count=False),
+    "MergeSort": lambda numbers: merge_sort(numbers, 0, len(numbers) - 1, count=False),
+    "Counting Sort": counting_sort,
+    "Radix Sort": radix_sort,
+}
+
+# Used when no trained policy is given. These exemplars come from `train_policy` on the datasets.py shapes at
+# size 10,000: counting sort wins on integers in a narrow range, radix sort on integers in a wide range and
+# quicksort on floats. Retrain on the target machine and sizes to pick up shapes where another engine wins.
+DEFAULT_POLICY = [
+    {"Dataset": "Random", "Features": [0.434, 0.482, 0.84, 0.09, 1.0], "Engine": "Counting Sort"},
+    {"Dataset": "Nearly Sorted", "Features": [0.469, 0.001, 0.867, 0.091, 1.0], "Engine": "Counting Sort"},
+    {"Dataset": "Many Duplicates", "Features": [0.316, 0.416, 0.016, 0.001, 1.0], "Engine": "Counting Sort"},
+    {"Dataset": "Sorted with Indices Swapped", "Features": [0.156, 0.102, 1.0, 0.497, 1.0], "Engine": "Counting Sort"},
+    {"Dataset": "Evens", "Features": [0.453, 0.47, 1.0, 0.908, 1.0], "Engine": "Radix Sort"},
+    {"Dataset": "Float List", "Features": [0.449, 0.552, 1.0, 0.09, 0.0], "Engine": "QuickSort"},
+    {"Dataset": "Evenly distributed", "Features": [0.484, 0.437, 1.0, 0.09, 0.0], "Engine": "QuickSort"},
+]
+
+
+def probe_features(numbers: list[int | float], generator: random.Random | None = None) -> dict:
+    """
+    Estimate the presortedness features of `numbers` from a fixed-size random sample.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+        The values to probe. They are not modified.
+    generator : random.Random | None
+        The source of the sample positions. Defaults to a generator seeded with the size of the input, so
+        the same input always gets the same decision.
+
+    Returns
+    -------
+    dict
+        The value of every feature in `FEATURE_NAMES`.
+    """
+    size = len(numbers)
+    if size < 2:
+        return dict.fromkeys(FEATURE_NAMES, 0.0)
+    generator = generator or random.Random(size)
+
+    positions = [generator.randrange(size - 1) for _ in range(min(ADJACENT_SAMPLES, size - 1))]
+    descents = sum(numbers[position + 1] < numbers[position] for position in positions)
+
+    # Inversions are counted among the sampled values in their original order
+    sample = [numbers[position] for position in sorted(generator.sample(range(size), min(INVERSION_SAMPLES, size)))]
+    pairs = len(sample) * (len(sample) - 1) // 2
+    inversions = sum(sample[later] < sample[earlier]
+                     for earlier in range(len(sample)) for later in range(earlier + 1, len(sample)))
+
+    values = [numbers[position] for position in generator.sample(range(size), min(DISTINCT_SAMPLES, size))]
+    value_range = max(values) - min(values)
+    return {
+        "Descent Ratio": descents / len(positions),
+        "Inversion Ratio": inversions / pairs,
+        "Distinct Ratio": len(set(values)) / len(values),
+        "Range Ratio": value_range / (value_range + size),
+        "Integer Ratio": sum(isinstance(value, int) for value in values) / len(values),
+    }
+
+
+def is_ordered(numbers: list[int | float], descending: bool = False) -> bool:
+    """
+    Check whether `numbers` is sorted, stopping at the first pair out of order.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+    descending : bool
+        Check for non-increasing instead of non-decreasing order.
+
+    Returns
+    -------
+    bool
+    """
+    if descending:
+        return all(numbers[index + 1] <= numbers[index] for index in range(len(numbers) - 1))
+    return all(numbers[index] <= numbers[index + 1] for index in range(len(numbers) - 1))
+
+
+def choose_engine(features: dict, policy: list[dict] | None = None) -> str:
+    """
+    Choose the engine of the policy exemplar nearest to `features`.
+
+    Parameters
+    ----------
+    features : dict
+        The output of `probe_features`.
+    policy : list[dict] | None
+        Exemplars with "Features" and "Engine" keys, as made by `train_policy`. Defaults to `DEFAULT_POLICY`.
+
+    Returns
+    -------
+    str
+        A key of `ENGINES`.
+    """
+    point = [features[name] for name in FEATURE_NAMES]
+    nearest = min(policy or DEFAULT_POLICY, key=lambda exemplar: math.dist(point, exemplar["Features"]))
+    return nearest["Engine"]
+
+
+def sort(numbers: list[int | float], policy: list[dict] | None = None) -> str:
+    """
+    Sort `numbers` in-place with the engine best suited to its shape.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+        The list to be sorted (sorted in-place).
+    policy : list[dict] | None
+        The dispatch policy from `train_policy` or `load_policy`. Defaults to `DEFAULT_POLICY`.
+
+    Returns
+    -------
+    str
+        The decision: "Already Sorted", "Reversed" or the key of the engine in `ENGINES` that sorted the list.
+    """
+    features = probe_features(numbers)
+    if features["Descent Ratio"] == 0 and is_ordered(numbers):
+        decision = "Already Sorted"
+    elif numbers[-1] < numbers[0] and is_ordered(numbers, descending=True):
+        numbers.reverse()
+        decision = "Reversed"
+    else:
+        decision = choose_engine(features, policy)
+        ENGINES[decision](numbers)
+    logger.info("sorted %d values: %s (%s)", len(numbers), decision,
+                ", ".join(f"{name} {value:.3f}" for name, value in features.items()))
+    return decision
+
+
+def train_policy(datasets: dict[str, list], repeats: int = 3) -> list[dict]:
+    """
+    Build a dispatch policy by timing every engine on every dataset.
+
+    Each dataset becomes an exemplar holding its probed features and the engine with the lowest median time.
+    Datasets with fewer than two values or already sorted or reverse sorted datasets are skipped, as `sort`
+    never dispatches them to an engine.
+
+    Parameters
+    ----------
+    datasets : dict[str, list]
+        The training datasets by name, e.g. the dataset shapes of datasets.py.
+    repeats : int
+        The number of timed sorts per engine and dataset.
+
+    Returns
+    -------
+    list[dict]
+        One exemplar per dataset with "Dataset", "Features", "Engine" and the median "Times" of every engine.
+    """
+    policy = []
+    for name, numbers in datasets.items():
+        if len(numbers) < 2 or is_ordered(numbers) or is_ordered(numbers, descending=True):
+            continue
+        features = probe_features(numbers)
+        times = {}
+        for engine, sort_function in ENGINES.items():
+            samples = []
+            for _ in range(repeats):
+                working = list(numbers)
+                start = time.perf_counter()
+                sort_function(working)
+                samples.append(time.perf_counter() - start)
+            times[engine] = statistics.median(samples)
+        policy.append({
+            "Dataset": name,
+            "Features": [features[feature] for feature in FEATURE_NAMES],
+            "Engine": min(times, key=times.get),
+            "Times": times,
+        })
+        logger.info("trained on %s: %s", name, policy[-1]["Engine"])
+    return policy
+
+
+def save_policy(path: str, policy: list[dict]) -> None:
+    """
+    Write a dispatch policy to a JSON file.
+
+    Parameters
+    ----------
+    path : str
+    policy : list[dict]
+    """
+    with open(path, "w") as file:
+        json.dump(policy, file, indent=2)
+
+
+def load_policy(path: str) -> list[dict]:
+    """
+    Read a dispatch policy written by `save_policy`.
+
+    Parameters
+    ----------
+    path : str
+
+    Returns
+    -------
+    list[dict]
+    """
+    with open(path) as file:
+        return json.load(file)
+
+
+if __name__ == "__main__":
+    # Test the adaptive dispatcher
+    test_numbers = [5, 1, 4, 2, 8, 0, 2, 9, 7, 3] * 10
+    assert sort(test_numbers) in ENGINES and test_numbers == sorted(test_numbers)
+    assert sort(test_numbers) == "Already Sorted"
+    test_numbers.reverse()
+    assert sort(test_numbers) == "Reversed" and test_numbers == sorted(test_numbers)
+    assert sort([]) == "Already Sorted"
+    print("All tests passed!")
@@ -0,0 +1,204 @@
+"""
+Batched sorting of many short lists.
+
+Sorting tens of thousands of lists of 10-500 values one `quicksort` call at a time spends most of its time in
+Python call overhead. `sort_batch` instead lays the lists out as the rows of one padded 2D array and sorts
+all rows at once with NumPy's row-wise sort.
+
+The swap count of every row is its inversion count, the number of pairs of values out of order, which is
+what merge sort counts and what insertion sort swaps. It is computed for all rows together by a bottom-up
+merge: at every level, each value of a right block counts the values of its left block that are larger.
+Small blocks compare every pair directly; larger ones use one `np.searchsorted` over all blocks of all rows,
+kept apart by giving every block its own offset.
+"""
+import numpy as np
+
+# Blocks up to this width count their inversions by comparing every pair, which is faster than searching
+PAIRWISE_BLOCK_WIDTH = 16
+
+
+def pad_rows(rows: list[list[int | float]]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Lay out a ragged collection of lists as a padded 2D array.
+
+    The array has the common dtype of the rows, so int rows are turned into floats when any row holds a float.
+
+    Parameters
+    ----------
+    rows : list[list[int|float]]
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        The rows padded to the longest row, and the length of every row.
+    """
+    lengths = np.fromiter((len(row) for row in rows), dtype=np.int64, count=len(rows))
+    # Empty rows would otherwise make the array float
+    flat = np.concatenate([np.asarray(row) for row in rows if len(row)]) if lengths.sum() else np.zeros(0)
+    padded = np.zeros((len(rows), int(lengths.max(initial=0))), dtype=flat.dtype)
+    padded[np.arange(padded.shape[1]) < lengths[:, None]] = flat
+    return padded, lengths
+
+
+def fill_padding(values: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    Copy `values` with every position past the row length set to the largest value of its dtype.
+
+    The padding then sorts to the end of its row and is never out of order with the values of the row.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        2D array of rows.
+    lengths : np.ndarray
+        The number of values in each row.
+
+    Returns
+    -------
+    np.ndarray
+
+    Raises
+    ------
+    ValueError
+        If the rows are not numbers, or hold NaN, which would sort after the padding.
+    """
+    in_row = np.arange(values.shape[1]) < lengths[:, None]
+    if np.issubdtype(values.dtype, np.floating):
+        if np.isnan(values[in_row]).any():
+            raise ValueError("sort_batch cannot sort NaN values.")
+        largest = np.inf
+    elif np.issubdtype(values.dtype, np.integer):
+        largest = np.iinfo(values.dtype).max
+    else:
+        raise ValueError(f"sort_batch sorts numbers, not {values.dtype}.")
+    return np.where(in_row, values, largest)
+
+
+def count_inversions(values: np.ndarray) -> np.ndarray:
+    """
+    Count the inversions of every row of a 2D array.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        2D array of rows.
+
+    Returns
+    -------
+    np.ndarray
+        The number of pairs i < j with values[row, i] > values[row, j], per row.
+    """
+    row_count, width = values.shape
+    inversions = np.zeros(row_count, dtype=np.int64)
+    if width < 2:
+        return inversions
+    # Replace the values by their dense rank within the row, so every block can be offset into its own range
+    order = np.argsort(values, axis=1, kind="stable")
+    ordered = np.take_along_axis(values, order, axis=1)
+    ordered_ranks = np.zeros((row_count, width), dtype=np.int64)
+    ordered_ranks[:, 1:] = np.cumsum(ordered[:, 1:] != ordered[:, :-1], axis=1)
+    ranks = np.empty_like(ordered_ranks)
+    np.put_along_axis(ranks, order, ordered_ranks, axis=1)
+
+    # Pad to a power of two with a rank larger than every other, which adds no inversions
+    padded_width = 1 << (width - 1).bit_length()
+    blocks = np.full((row_count, padded_width), padded_width, dtype=np.int32)
+    blocks[:, :width] = ranks
+    block_width = 1
+    while block_width < padded_width:
+        pairs = blocks.reshape(row_count, padded_width // (2 * block_width), 2, block_width)
+        if block_width <= PAIRWISE_BLOCK_WIDTH:
+            inversions += (pairs[:, :, 0, :, None] > pairs[:, :, 1, None, :]).sum(axis=(1, 2, 3))
+        else:
+            block_numbers = np.arange(row_count * pairs.shape[1], dtype=np.int64).reshape(row_count, -1, 1)
+            left = (pairs[:, :, 0, :] + block_numbers * (padded_width + 1)).reshape(-1)
+            right = pairs[:, :, 1, :] + block_numbers * (padded_width + 1)
+            # Left values no larger than each right value, less the values of all earlier blocks
+            not_larger = np.searchsorted(left, right.reshape(-1), side="right").reshape(right.shape)
+            not_larger -= block_numbers * block_width
+            inversions += (block_width - not_larger).sum(axis=(1, 2))
+        block_width *= 2
+        blocks = np.sort(blocks.reshape(row_count, -1, block_width), axis=-1).reshape(row_count, padded_width)
+    return inversions
+
+
+def sort_batch(rows, lengths=None, count: bool = True):
+    """
+    Sort every row of a batch of lists.
+
+    Parameters
+    ----------
+    rows : list[list[int|float]] | np.ndarray
+        A ragged collection of lists, or a 2D array whose rows hold `lengths` values each followed by padding.
+    lengths : array-like | None
+        The number of values in each row of a 2D array. Defaults to the full width. Ignored for lists.
+    count : bool
+        Also count the swaps (inversions) of every row.
+
+    Returns
+    -------
+    tuple
+        The sorted rows, in the form they were given (lists, or a 2D array with the padding left in place),
+        and the swap count of every row as an array, or None if `count` is False. Lists of ints stay ints when
+        other lists hold floats.
+
+    Raises
+    ------
+    ValueError
+        If the rows hold NaN or values that are not numbers.
+    """
+    ragged = not isinstance(rows, np.ndarray)
+    if ragged:
+        # Sort the rows of every dtype as a separate batch, so int rows are not padded into a float array
+        groups = {}
+        for index, row in enumerate(rows):
+            if len(row):
+                groups.setdefault(np.asarray(row).dtype, []).append(index)
+        if len(groups) > 1:
+            sorted_rows = [[] for _ in rows]
+            swaps = np.zeros(len(rows), dtype=np.int64) if count else None
+            for indices in groups.values():
+                group_rows, group_swaps = sort_batch([rows[index] for index in indices], count=count)
+                for index, row in zip(indices, group_rows):
+                    sorted_rows[index] = row
+                if count:
+                    swaps[indices] = group_swaps
+            return sorted_rows, swaps
+        values, lengths = pad_rows(rows)
+    else:
+        values = rows
+        lengths = np.full(len(values), values.shape[1], dtype=np.int64) if lengths is None else np.asarray(lengths)
+    filled = fill_padding(values, lengths)
+    swaps = count_inversions(filled) if count else None
+    ordered = np.sort(filled, axis=1)
+    if ragged:
+        return [row[:length] for row, length in zip(ordered.tolist(), lengths.tolist())], swaps
+    in_row = np.arange(values.shape[1]) < lengths[:, None]
+    return np.where(in_row, ordered, values), swaps
+
+
+if __name__ == "__main__":
+    # Test batched sorting and inversion counting
+    from merge_sort import merge_sort
+
+    test_generator = np.random.default_rng(0)
+    test_rows = [test_generator.integers(0, 20, test_generator.integers(0, 40)).tolist() for _ in range(200)]
+    test_rows.append([2.5, -1.0, 2.5, 0.0])
+    sorted_rows, test_swaps = sort_batch(test_rows)
+    for test_row, sorted_row, test_swap in zip(test_rows, sorted_rows, test_swaps):
+        expected = list(test_row)
+        assert merge_sort(expected, 0, len(expected) - 1) == test_swap
+        assert sorted_row == expected
+        assert all(type(value) is type(test_row[0]) for value in sorted_row)
+    assert sort_batch([[], [3, 2], [], [0.5, -0.5]], count=False)[0] == [[], [2, 3], [], [-0.5, 0.5]]
+    assert type(sort_batch([[], [2 ** 60 + 1, 2 ** 60], [0.5]])[0][1][0]) is int
+    try:
+        sort_batch([[1.0, float("nan")], [2.0]])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("NaN must be rejected")
+    test_array = np.array([[3, 1, 2, 9], [5, 4, 0, 0]])
+    sorted_array, test_swaps = sort_batch(test_array, lengths=[3, 2])
+    assert sorted_array.tolist() == [[1, 2, 3, 9], [4, 5, 0, 0]] and test_swaps.tolist() == [2, 1]
+    print("All tests passed!")
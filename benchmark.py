@@ -0,0 +1,594 @@
+"""
+Benchmark cells shared by the result tables in main.py.
+
+A benchmark cell is one sorting algorithm applied to one dataset. The functions in this module are
+module-level so that they can be sent to the worker processes started by `parallel.run_cells`.
+
+Every cell runs in a freshly started worker, so this module imports only the pure-Python sorts up front. The
+NumPy-backed sorts (counting, radix, adaptive and batch sorting) are imported by their runners, and only the
+cells that use them pay for importing NumPy.
+"""
+import fnmatch
+import statistics
+import time
+import tracemalloc
+
+from instrumentation import Probe, profile_call
+from memory_usage import MemorySampler
+from merge_sort import merge_sort
+from parallel import run_cells
+from quicksort import quicksort
+from result_cache import ResultCache
+from shell_sort import shell_sort
+
+
+def run_shell_sort(numbers: list[int | float]) -> int:
+    """
+    Sort `numbers` in-place with shell sort.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+
+    Returns
+    -------
+    int
+        The total number of swaps over all gap values.
+    """
+    return sum(shell_sort(numbers))
+
+
+def run_quicksort(numbers: list[int | float]) -> int:
+    """
+    Sort `numbers` in-place with quicksort.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+
+    Returns
+    -------
+    int
+        The number of swaps made.
+    """
+    return quicksort(numbers, 0, len(numbers) - 1)
+
+
+def run_quicksort_median_of_three(numbers: list[int | float]) -> int:
+    """
+    Sort `numbers` in-place with quicksort, choosing every pivot as the median of three.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+
+    Returns
+    -------
+    int
+        The number of swaps made.
+    """
+    return quicksort(numbers, 0, len(numbers) - 1, pivot_rule="Median of Three")
+
+
+def run_quicksort_ninther(numbers: list[int | float]) -> int:
+    """
+    Sort `numbers` in-place with quicksort, choosing every pivot as the ninther.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+
+    Returns
+    -------
+    int
+        The number of swaps made.
+    """
+    return quicksort(numbers, 0, len(numbers) - 1, pivot_rule="Ninther")
+
+
+def run_merge_sort(numbers: list[int | float]) -> int:
+    """
+    Sort `numbers` in-place with merge sort.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+
+    Returns
+    -------
+    int
+        The number of swaps (inversions) counted.
+    """
+    return merge_sort(numbers, 0, len(numbers) - 1)
+
+
+def run_in_place_merge_sort(numbers: list[int | float]) -> int:
+    """
+    Sort `numbers` in-place with the buffer-free merge sort.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+
+    Returns
+    -------
+    int
+        The number of swaps (inversions) counted.
+    """
+    return merge_sort(numbers, 0, len(numbers) - 1, in_place=True)
+
+
+def run_shell_sort_uncounted(numbers: list[int | float]) -> None:
+    """
+    Sort `numbers` in-place with shell sort, without swap counting.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+    """
+    shell_sort(numbers, count=False)
+
+
+def run_quicksort_uncounted(numbers: list[int | float]) -> None:
+    """
+    Sort `numbers` in-place with quicksort, without swap counting.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+    """
+    quicksort(numbers, 0, len(numbers) - 1, count=False)
+
+
+def run_merge_sort_uncounted(numbers: list[int | float]) -> None:
+    """
+    Sort `numbers` in-place with merge sort, without swap counting.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+    """
+    merge_sort(numbers, 0, len(numbers) - 1, count=False)
+
+
+def run_counting_sort(numbers: list[int | float]) -> None:
+    """
+    Sort `numbers` in-place with counting sort, which makes no swaps.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+    """
+    from radix_sort import counting_sort
+    counting_sort(numbers)
+
+
+def run_radix_sort(numbers: list[int | float]) -> None:
+    """
+    Sort `numbers` in-place with LSD radix sort, which makes no swaps.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+    """
+    from radix_sort import radix_sort
+    radix_sort(numbers)
+
+
+def run_adaptive_sort(numbers: list[int | float]) -> None:
+    """
+    Sort `numbers` in-place with the engine the adaptive dispatcher picks for its shape.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+    """
+    from adaptive_sort import sort as adaptive_sort
+    adaptive_sort(numbers)
+
+
+# Algorithms are looked up by name inside the worker processes. Uncounted variants and the
+# non-comparison sorts return no swap count.
+SORTING_ALGORITHMS = {
+    "Shell Sort": run_shell_sort,
+    "Shell Sort (uncounted)": run_shell_sort_uncounted,
+    "QuickSort": run_quicksort,
+    "QuickSort (uncounted)": run_quicksort_uncounted,
+    "QuickSort (median of three)": run_quicksort_median_of_three,
+    "QuickSort (ninther)": run_quicksort_ninther,
+    "MergeSort": run_merge_sort,
+    "MergeSort (uncounted)": run_merge_sort_uncounted,
+    "In-Place MergeSort": run_in_place_merge_sort,
+    "Counting Sort": run_counting_sort,
+    "Radix Sort": run_radix_sort,
+    "Adaptive Sort": run_adaptive_sort,
+}
+
+
+def run_shell_sort_probed(numbers: list[int | float], probe: Probe) -> int:
+    """
+    Sort `numbers` in-place with shell sort, recording into `probe`.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+    probe : Probe
+
+    Returns
+    -------
+    int
+        The total number of swaps over all gap values.
+    """
+    return sum(shell_sort(numbers, probe=probe))
+
+
+def run_quicksort_probed(numbers: list[int | float], probe: Probe) -> int:
+    """
+    Sort `numbers` in-place with quicksort, recording into `probe`.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+    probe : Probe
+
+    Returns
+    -------
+    int
+        The number of swaps made.
+    """
+    return quicksort(numbers, 0, len(numbers) - 1, probe=probe)
+
+
+def run_quicksort_median_of_three_probed(numbers: list[int | float], probe: Probe) -> int:
+    """
+    Sort `numbers` in-place with median-of-three quicksort, recording into `probe`.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+    probe : Probe
+
+    Returns
+    -------
+    int
+        The number of swaps made.
+    """
+    return quicksort(numbers, 0, len(numbers) - 1, probe=probe, pivot_rule="Median of Three")
+
+
+def run_quicksort_ninther_probed(numbers: list[int | float], probe: Probe) -> int:
+    """
+    Sort `numbers` in-place with ninther quicksort, recording into `probe`.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+    probe : Probe
+
+    Returns
+    -------
+    int
+        The number of swaps made.
+    """
+    return quicksort(numbers, 0, len(numbers) - 1, probe=probe, pivot_rule="Ninther")
+
+
+def run_merge_sort_probed(numbers: list[int | float], probe: Probe) -> int:
+    """
+    Sort `numbers` in-place with merge sort, recording into `probe`.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+    probe : Probe
+
+    Returns
+    -------
+    int
+        The number of swaps (inversions) counted.
+    """
+    return merge_sort(numbers, 0, len(numbers) - 1, probe=probe)
+
+
+# The probed variant of each algorithm. Uncounted variants share the probed variant of their base algorithm.
+PROBED_ALGORITHMS = {
+    "Shell Sort": run_shell_sort_probed,
+    "QuickSort": run_quicksort_probed,
+    "QuickSort (median of three)": run_quicksort_median_of_three_probed,
+    "QuickSort (ninther)": run_quicksort_ninther_probed,
+    "MergeSort": run_merge_sort_probed,
+}
+
+
+def run_batch_sort(rows: list[list[int | float]], count: bool = True):
+    """
+    Sort every list of a batch with one `sort_batch` call.
+
+    Parameters
+    ----------
+    rows : list[list[int|float]]
+    count : bool
+        Also count the swaps of every list.
+
+    Returns
+    -------
+    np.ndarray | None
+        The swap count of every list, or None if `count` is False.
+    """
+    from batch_sort import sort_batch
+    return sort_batch(rows, count=count)[1]
+
+
+# Ways to sort a batch of lists: one sort call per list, or all lists at once with `sort_batch`.
+# Every method returns the swap count of each list.
+BATCH_METHODS = {
+    "Shell Sort (per list)": lambda rows: [run_shell_sort(row) for row in rows],
+    "QuickSort (per list)": lambda rows: [run_quicksort(row) for row in rows],
+    "MergeSort (per list)": lambda rows: [run_merge_sort(row) for row in rows],
+    "Batch Sort": run_batch_sort,
+    "Batch Sort (uncounted)": lambda rows: run_batch_sort(rows, count=False),
+}
+
+
+def select_algorithms(patterns: list[str] | None = None) -> list[str]:
+    """
+    Select algorithm names matching any of the given names or glob patterns.
+
+    Matching ignores case, spaces, dashes and underscores, so "quicksort", "shell_sort" and "merge*" all match.
+
+    Parameters
+    ----------
+    patterns : list[str] | None
+        Names or glob patterns. All algorithms are selected if None.
+
+    Returns
+    -------
+    list[str]
+        The matching keys of `SORTING_ALGORITHMS`, in registry order.
+    """
+    if not patterns:
+        return list(SORTING_ALGORITHMS)
+
+    def normalize(name: str) -> str:
+        return name.lower().replace(" ", "").replace("-", "").replace("_", "")
+
+    names = [name for name in SORTING_ALGORITHMS
+             if any(fnmatch.fnmatch(normalize(name), normalize(pattern)) for pattern in patterns)]
+    if not names:
+        raise ValueError(f"No algorithm matches {patterns}. Available algorithms: {', '.join(SORTING_ALGORITHMS)}")
+    return names
+
+
+def warm_up(sort_function) -> None:
+    """
+    Sort an empty input once, so the imports a runner makes on first use are not measured.
+
+    Parameters
+    ----------
+    sort_function : callable
+        A value of `SORTING_ALGORITHMS` or `BATCH_METHODS`.
+    """
+    sort_function([])
+
+
+def time_algorithm(algorithm: str, numbers: list[int | float], repeats: int = 1) -> dict:
+    """
+    Time `repeats` sorts of fresh copies of `numbers`.
+
+    Parameters
+    ----------
+    algorithm : str
+        A key of `SORTING_ALGORITHMS`.
+    numbers : list[int|float]
+        The dataset to sort. It is left unchanged.
+    repeats : int
+        The number of timed sorts.
+
+    Returns
+    -------
+    dict
+        The median elapsed time in seconds, the elapsed time of every repeat and the swap count
+        reported by the algorithm (None for uncounted variants).
+    """
+    sort_function = SORTING_ALGORITHMS[algorithm]
+    warm_up(sort_function)
+    times = []
+    for _ in range(repeats):
+        working = list(numbers)
+        start = time.perf_counter()
+        swaps = sort_function(working)
+        times.append(time.perf_counter() - start)
+    return {"Time (s)": statistics.median(times), "Times": times, "Swaps": swaps}
+
+
+def time_batch(method: str, rows: list[list[int | float]], repeats: int = 1) -> dict:
+    """
+    Time `repeats` sorts of fresh copies of a batch of lists.
+
+    Parameters
+    ----------
+    method : str
+        A key of `BATCH_METHODS`.
+    rows : list[list[int|float]]
+        The lists to sort. They are left unchanged.
+    repeats : int
+        The number of timed sorts of the whole batch.
+
+    Returns
+    -------
+    dict
+        The median elapsed time in seconds, the elapsed time of every repeat and the median throughput in
+        lists per second.
+    """
+    sort_function = BATCH_METHODS[method]
+    warm_up(sort_function)
+    times = []
+    for _ in range(repeats):
+        working = [list(row) for row in rows]
+        start = time.perf_counter()
+        sort_function(working)
+        times.append(time.perf_counter() - start)
+    median = statistics.median(times)
+    return {"Time (s)": median, "Times": times, "Lists/s": len(rows) / median if median > 0 else float("inf")}
+
+
+def trace_memory(algorithm: str, numbers: list[int | float]) -> dict:
+    """
+    Measure the peak Python heap allocation of a single sort of `numbers` with tracemalloc.
+
+    Parameters
+    ----------
+    algorithm : str
+        A key of `SORTING_ALGORITHMS`.
+    numbers : list[int|float]
+        The dataset to sort (sorted in-place).
+
+    Returns
+    -------
+    dict
+        The peak traced allocation in bytes.
+    """
+    sort_function = SORTING_ALGORITHMS[algorithm]
+    warm_up(sort_function)
+    tracemalloc.start()
+    sort_function(numbers)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"Peak Memory (bytes)": peak}
+
+
+def sample_memory(algorithm: str, numbers: list[int | float], interval: float = 0.005) -> dict:
+    """
+    Sample the resident memory of this process over a single sort of `numbers`.
+
+    Unlike `trace_memory`, this sees native allocations (e.g. NumPy buffers) and adds no tracing overhead
+    to the sort itself. Run it in a fresh worker process so the figures belong to this sort alone.
+
+    Parameters
+    ----------
+    algorithm : str
+        A key of `SORTING_ALGORITHMS`.
+    numbers : list[int|float]
+        The dataset to sort (sorted in-place).
+    interval : float
+        The time between two memory samples in seconds.
+
+    Returns
+    -------
+    dict
+        The peak RSS and USS in bytes and the sampled (seconds, RSS, USS) timeline.
+    """
+    sort_function = SORTING_ALGORITHMS[algorithm]
+    warm_up(sort_function)
+    with MemorySampler(interval) as sampler:
+        sort_function(numbers)
+    return {"Peak RSS (bytes)": sampler.peak_rss, "Peak USS (bytes)": sampler.peak_uss, "Timeline": sampler.timeline}
+
+
+def probe_algorithm(algorithm: str, numbers: list[int | float]) -> dict:
+    """
+    Sort `numbers` once with the probed variant of `algorithm` and report the recorded counters.
+
+    Parameters
+    ----------
+    algorithm : str
+        A key of `SORTING_ALGORITHMS`. An uncounted variant is probed through its base algorithm.
+    numbers : list[int|float]
+        The dataset to sort (sorted in-place).
+
+    Returns
+    -------
+    dict
+        The `Probe.report` of the sort, or an empty dict for algorithms without a probed variant.
+    """
+    sort_function = PROBED_ALGORITHMS.get(algorithm.removesuffix(" (uncounted)"))
+    if sort_function is None:
+        return {}
+    probe = Probe()
+    sort_function(numbers, probe)
+    return probe.report()
+
+
+def profile_algorithm(algorithm: str, numbers: list[int | float], path: str) -> dict:
+    """
+    Sort `numbers` once under cProfile and write the pstats to `path`.
+
+    Parameters
+    ----------
+    algorithm : str
+        A key of `SORTING_ALGORITHMS`.
+    numbers : list[int|float]
+        The dataset to sort (sorted in-place).
+    path : str
+        The file to write the pstats to.
+
+    Returns
+    -------
+    dict
+        The path of the pstats file.
+    """
+    warm_up(SORTING_ALGORITHMS[algorithm])
+    profile_call(path, SORTING_ALGORITHMS[algorithm], numbers)
+    return {"Profile": path}
+
+
+def run_matrix(function, algorithms: list[str], datasets: dict[str, list], max_workers: int | None = None,
+               pin_cpus: bool = False, timeout: float | None = None,
+               exclude: set[tuple[str, str]] = frozenset(), arguments: tuple = (),
+               cache: ResultCache | None = None) -> dict[tuple[str, str], dict]:
+    """
+    Run `function` for every algorithm x dataset cell, each cell in an isolated worker process.
+
+    Cells that exceed the time budget are cancelled and reported as `{"Timed Out": True}`; all other
+    cells report `"Timed Out": False` next to their measurements. With a cache, cells whose result is cached
+    are not run, and the results of the cells that are run are stored in it.
+
+    Parameters
+    ----------
+    function : callable
+        A cell function such as `time_algorithm`, `trace_memory` or `sample_memory`.
+    algorithms : list[str]
+        Keys of `SORTING_ALGORITHMS`.
+    datasets : dict[str, list]
+        The datasets by name. Every cell receives its own copy of the data.
+    max_workers : int | None
+        The maximum number of cells running at the same time.
+    pin_cpus : bool
+        Pin each worker process to its own CPU.
+    timeout : float | None
+        The wall-clock budget of each cell in seconds.
+    exclude : set[tuple[str, str]]
+        (dataset name, algorithm) cells to skip.
+    arguments : tuple
+        Extra positional arguments passed to `function` after the algorithm and the dataset.
+    cache : ResultCache | None
+        The cache of cell results.
+
+    Returns
+    -------
+    dict[tuple[str, str], dict]
+        The result of each cell that was run, keyed by (dataset name, algorithm).
+    """
+    keys = [(name, algorithm) for name in datasets for algorithm in algorithms if (name, algorithm) not in exclude]
+    results = {}
+    cache_keys = {}
+    if cache is not None:
+        for name, algorithm in keys:
+            runners = (SORTING_ALGORITHMS.get(algorithm), PROBED_ALGORITHMS.get(algorithm.removesuffix(" (uncounted)")),
+                       BATCH_METHODS.get(algorithm))
+            runners = tuple(runner for runner in runners if runner is not None)
+            cache_keys[name, algorithm] = cache.key(function, algorithm, runners, datasets[name], arguments)
+            cached = cache.get(cache_keys[name, algorithm])
+            if cached is not None:
+                results[name, algorithm] = {**cached, "Timed Out": False}
+    pending = [key for key in keys if key not in results]
+    cells = [(algorithm, datasets[name], *arguments) for name, algorithm in pending]
+    measurements = run_cells(function, cells, max_workers=max_workers, pin_cpus=pin_cpus, timeout=timeout)
+    for key, measurement in zip(pending, measurements):
+        if measurement is None:
+            results[key] = {"Timed Out": True}
+            continue
+        if cache is not None:
+            cache.put(cache_keys[key], measurement)
+        results[key] = {**measurement, "Timed Out": False}
+    return {key: results[key] for key in keys}
@@ -0,0 +1,625 @@
+"""
+Command-line benchmark driver.
+
+Run it as a module from the project directory:
+
+    python -m cli run --algorithm quicksort --dataset Fractal --size 1000000
+    python -m cli run --algorithm "*sort*" --dataset "*sorted*" --size 1000 --size 10000 --dry-run
+    python -m cli run --algorithm quicksort --seed 1 --refresh
+    python -m cli suite
+    python -m cli sweep --max-size 100000 --timeout 10 --back-off
+    python -m cli compare baseline --store results.db
+    python -m cli train --output policy.json
+    python -m cli batch --lists 10000 --min-length 10 --max-length 500
+    python -m cli sort-file values.bin --dtype int64 --algorithm quicksort
+    python -m cli sample-sort --nodes 4 --size 1000000 -d "Uneven*"
+    python -m cli list
+
+`python main.py` is a shortcut for `python -m cli suite`, the full report of every table.
+"""
+import argparse
+import random
+import sys
+
+from benchmark import select_algorithms
+from datasets import (ADVERSARIAL_DATASETS,
+                      ALL_DATASETS,
+                      STRUCTURED_DATASETS,
+                      generate_datasets,
+                      seed_datasets,
+                      select_dataset_names)
+from tables import RecordTable
+
+
+def format_table(results, output_format: str) -> str:
+    """
+    Render a result table as text.
+
+    Parameters
+    ----------
+    results : RecordTable | pd.DataFrame
+    output_format : str
+        "table", "csv" or "json".
+
+    Returns
+    -------
+    str
+    """
+    if output_format == "csv":
+        return results.to_csv(index=False)
+    if output_format == "json":
+        return results.to_json(orient="records", indent=2)
+    return results.to_string(index=False)
+
+
+def positive_int(value: str) -> int:
+    """
+    Parse a command-line count that must be at least 1, e.g. the number of repeats.
+
+    Parameters
+    ----------
+    value : str
+
+    Returns
+    -------
+    int
+
+    Raises
+    ------
+    argparse.ArgumentTypeError
+        If the value is not a whole number of at least 1.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, not {number}")
+    return number
+
+
+def add_execution_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the arguments shared by every command that runs benchmark cells.
+
+    Parameters
+    ----------
+    parser : argparse.ArgumentParser
+    """
+    parser.add_argument("--workers", type=int, default=None,
+                        help="maximum number of benchmark cells running at once (default: number of CPUs)")
+    parser.add_argument("--pin-cpus", action="store_true", help="pin each worker process to its own CPU")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="wall-clock budget in seconds for each benchmark cell; slower cells are cancelled")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed for the dataset generators (default: a random seed, recorded with the results)")
+    parser.add_argument("--store", default=None, metavar="PATH",
+                        help="append the numeric results to a .db (SQLite) or .csv results store")
+    parser.add_argument("--label", default=None, help="name of this run in the results store, e.g. baseline")
+    parser.add_argument("--cache", default=".benchmark-cache", metavar="DIR",
+                        help="directory of cached cell results, used with --seed only; cells whose code and data are "
+                             "unchanged are not rerun (default: .benchmark-cache)")
+    parser.add_argument("--no-cache", action="store_true", help="run every cell without reading or writing the cache")
+    parser.add_argument("--refresh", action="store_true", help="rerun every cell and overwrite its cached result")
+
+
+def add_selection_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the algorithm and dataset selection arguments.
+
+    Parameters
+    ----------
+    parser : argparse.ArgumentParser
+    """
+    parser.add_argument("-a", "--algorithm", action="append", default=None, metavar="NAME",
+                        help="algorithm name or glob, e.g. quicksort or 'merge*' (repeatable; default: all)")
+    parser.add_argument("-d", "--dataset", action="append", default=None, metavar="NAME",
+                        help="dataset name or glob, e.g. Fractal or '*sorted*' (repeatable; default: all)")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build the argument parser with one sub-command per benchmark mode.
+
+    Returns
+    -------
+    argparse.ArgumentParser
+    """
+    parser = argparse.ArgumentParser(prog="python -m cli", description="Benchmark shell sort, quicksort and merge sort.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="time selected algorithms on selected datasets and sizes")
+    add_selection_arguments(run)
+    run.add_argument("-n", "--size", action="append", type=int, default=None,
+                     help="dataset size (repeatable; default: 10000)")
+    run.add_argument("-r", "--repeats", type=positive_int, default=1, help="number of timed sorts per cell")
+    run.add_argument("--memory", action="store_true", help="also profile the peak RSS, USS and Python heap")
+    run.add_argument("--probe", action="store_true",
+                     help="also count comparisons, moves, recursion depth and partition balance, and time each phase")
+    run.add_argument("--profile", default=None, metavar="DIR",
+                     help="also run every cell under cProfile and write one .pstats file per cell to DIR")
+    run.add_argument("--format", choices=["table", "csv", "json"], default="table", help="output format")
+    run.add_argument("--dry-run", action="store_true", help="list the benchmark matrix without running it")
+    add_execution_arguments(run)
+
+    suite = commands.add_parser("suite", help="run the full report: general, algorithm-specific and memory tables")
+    suite.add_argument("-n", "--size", type=int, default=10000, help="dataset size (default: 10000)")
+    suite.add_argument("-r", "--repeats", type=positive_int, default=1,
+                       help="number of timed sorts per cell; use several to compare runs statistically")
+    suite.add_argument("--memory-timeline", default=None, metavar="PATH",
+                       help="write the sampled memory-over-time timeline of every sort to a CSV file")
+    add_execution_arguments(suite)
+
+    sweep = commands.add_parser("sweep", help="run over log-spaced sizes and fit the empirical complexity")
+    add_selection_arguments(sweep)
+    sweep.add_argument("--min-size", type=int, default=1_000, help="smallest size of the sweep")
+    sweep.add_argument("--max-size", type=int, default=32_000, help="largest size of the sweep")
+    sweep.add_argument("--steps", type=int, default=6, help="number of log-spaced sizes in the sweep")
+    sweep.add_argument("--target-size", type=int, default=1_000_000, help="size to extrapolate the runtimes to")
+    sweep.add_argument("--back-off", action="store_true",
+                       help="stop growing the size of an algorithm on a dataset once it has timed out")
+    sweep.add_argument("--format", choices=["table", "csv", "json"], default="table", help="output format")
+    add_execution_arguments(sweep)
+
+    compare = commands.add_parser("compare", help="compare a saved run against a baseline and flag regressions")
+    compare.add_argument("baseline", help="run id or label of the baseline")
+    compare.add_argument("--store", required=True, metavar="PATH", help="the results store")
+    compare.add_argument("--candidate", default=None, help="run id or label to compare (default: the latest run)")
+    compare.add_argument("--threshold", type=float, default=0.05,
+                         help="relative slowdown or memory growth that counts as a regression (default: 0.05)")
+    compare.add_argument("--alpha", type=float, default=0.05,
+                         help="significance level for timing regressions; needs 3+ repeats per run (default: 0.05)")
+    compare.add_argument("--format", choices=["table", "csv", "json"], default="table", help="output format")
+
+    batch = commands.add_parser("batch", help="measure the throughput of sorting many short lists")
+    batch.add_argument("--lists", type=int, default=10000, help="number of lists in the batch (default: 10000)")
+    batch.add_argument("--min-length", type=int, default=10, help="shortest list length (default: 10)")
+    batch.add_argument("--max-length", type=int, default=500, help="longest list length (default: 500)")
+    batch.add_argument("-r", "--repeats", type=positive_int, default=1, help="number of timed sorts of the batch per method")
+    batch.add_argument("--format", choices=["table", "csv", "json"], default="table", help="output format")
+    add_execution_arguments(batch)
+
+    sort_file = commands.add_parser("sort-file", help="sort a flat binary file of numbers in place through mmap")
+    sort_file.add_argument("path", help="the file to sort")
+    sort_file.add_argument("--dtype", choices=["int64", "float64", "int32", "float32"], default="int64",
+                           help="type of the values in the file (default: int64)")
+    sort_file.add_argument("-a", "--algorithm", default="QuickSort", metavar="NAME",
+                           help="QuickSort, MergeSort or Shell Sort (default: QuickSort)")
+    sort_file.add_argument("--block-size", type=int, default=None, metavar="VALUES",
+                           help="sort blocks of this many values first, then merge them in place")
+    sort_file.add_argument("--format", choices=["table", "csv", "json"], default="table", help="output format")
+
+    sample = commands.add_parser("sample-sort", help="sample sort datasets across worker processes standing in for nodes")
+    sample.add_argument("-d", "--dataset", action="append", default=None, metavar="NAME",
+                        help="dataset name or glob (repeatable; default: Random, Many Duplicates and the uneven datasets)")
+    sample.add_argument("-n", "--size", type=int, default=1_000_000, help="dataset size (default: 1000000)")
+    sample.add_argument("--nodes", type=int, default=4, help="number of worker processes (default: 4)")
+    sample.add_argument("-a", "--algorithm", default="QuickSort", metavar="NAME",
+                        help="the sort run on every node, e.g. QuickSort, MergeSort or Shell Sort (default: QuickSort)")
+    sample.add_argument("--oversampling", type=int, default=32, help="sampled values per node (default: 32)")
+    sample.add_argument("--seed", type=int, default=None, help="seed for the dataset generators and the sample")
+    sample.add_argument("--format", choices=["table", "csv", "json"], default="table", help="output format")
+
+    train = commands.add_parser("train", help="train the dispatch policy of the adaptive sort on the dataset shapes")
+    train.add_argument("-d", "--dataset", action="append", default=None, metavar="NAME",
+                       help="dataset name or glob to train on (repeatable; default: all but Large Random)")
+    train.add_argument("-n", "--size", type=int, default=10000, help="dataset size (default: 10000)")
+    train.add_argument("-r", "--repeats", type=positive_int, default=3, help="number of timed sorts per engine and dataset")
+    train.add_argument("--output", default="policy.json", metavar="PATH", help="the JSON file to write the policy to")
+    train.add_argument("--seed", type=int, default=None, help="seed for the dataset generators")
+
+    commands.add_parser("list", help="list the available algorithms and datasets")
+    return parser
+
+
+def seed_run(seed: int | None) -> int:
+    """
+    Seed the dataset generators, drawing a random seed if none is given.
+
+    Parameters
+    ----------
+    seed : int | None
+
+    Returns
+    -------
+    int
+        The seed used, so it can be recorded with the results.
+    """
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    seed_datasets(seed)
+    return seed
+
+
+def open_cache(args: argparse.Namespace):
+    """
+    Open the result cache given on the command line.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+
+    Returns
+    -------
+    ResultCache | None
+        The cache, or None with --no-cache or without --seed. A random seed gives new datasets on every run, so
+        their results would only fill the cache with entries that are never read.
+    """
+    if args.no_cache or args.seed is None:
+        return None
+    from result_cache import ResultCache
+    return ResultCache(args.cache, args.refresh)
+
+
+def report_cache(cache) -> None:
+    """
+    Print how many cells were read from the cache and how many were run.
+
+    Parameters
+    ----------
+    cache : ResultCache | None
+    """
+    if cache is not None:
+        print(f"Cache: {cache.hits} cells reused, {cache.misses} cells run ({cache.directory})", file=sys.stderr)
+
+
+def save(args: argparse.Namespace, seed: int, tables: dict) -> None:
+    """
+    Save result tables to the results store given on the command line, if any.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+    seed : int
+    tables : dict[str, RecordTable]
+    """
+    if args.store:
+        from results_store import collect_metadata, save_run
+        frames = {name: table.to_frame() for name, table in tables.items()}
+        run = save_run(args.store, frames, collect_metadata(seed, args.label))
+        print(f"Saved run {run} (seed {seed}) to {args.store}", file=sys.stderr)
+
+
+def run_command(args: argparse.Namespace) -> int:
+    """
+    Time the selected algorithm x dataset x size matrix, or list it with --dry-run.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+
+    Returns
+    -------
+    int
+        The exit status.
+    """
+    algorithms = select_algorithms(args.algorithm)
+    dataset_names = select_dataset_names(args.dataset)
+    sizes = args.size or [10000]
+    if args.dry_run:
+        for size in sizes:
+            for name in dataset_names:
+                for algorithm in algorithms:
+                    print(f"{algorithm:<12} {name:<34} {size:>12,}  x{args.repeats}")
+        print(f"{len(sizes) * len(dataset_names) * len(algorithms)} cells", file=sys.stderr)
+        return 0
+
+    from main import time_selection
+    seed = seed_run(args.seed)
+    cache = open_cache(args)
+    results = time_selection(algorithms, dataset_names, sizes, args.workers, args.pin_cpus, args.timeout,
+                             args.repeats, args.memory, args.probe, args.profile, cache)
+    report_cache(cache)
+    save(args, seed, {"Selection": results})
+    print(format_table(results, args.format))
+    return 0
+
+
+def suite_command(args: argparse.Namespace) -> int:
+    """
+    Run the full report: the general, algorithm-specific and memory tables.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+
+    Returns
+    -------
+    int
+        The exit status.
+    """
+    from main import (general_datasets,
+                      measure_memory_allocation,
+                      time_merge_sort_algorithm,
+                      time_quick_sort_algorithm,
+                      time_shell_sort_algorithm,
+                      time_sorting_algorithms)
+    seed = seed_run(args.seed)
+    cache = open_cache(args)
+    dataset_size = args.size
+    datasets = general_datasets(dataset_size)
+    general_results = time_sorting_algorithms(dataset_size, args.workers, args.pin_cpus, args.timeout, datasets,
+                                              args.repeats, cache)
+    memory_allocation_results, memory_timeline = measure_memory_allocation(dataset_size, args.workers,
+                                                                           args.pin_cpus, args.timeout, datasets,
+                                                                           cache=cache)
+    shell_sort_results = time_shell_sort_algorithm(dataset_size, args.workers, args.pin_cpus, args.timeout,
+                                                   args.repeats, cache)
+    quicksort_results = time_quick_sort_algorithm(dataset_size, args.workers, args.pin_cpus, args.timeout,
+                                                  args.repeats, cache)
+    merge_sort_results = time_merge_sort_algorithm(dataset_size, args.workers, args.pin_cpus, args.timeout,
+                                                   args.repeats, cache)
+    report_cache(cache)
+    memory_rows = {(row["Dataset"], row["Size"]): row for row in memory_allocation_results}
+    general_results = RecordTable([{**row, **memory_rows[row["Dataset"], row["Size"]]} for row in general_results],
+                                  general_results.integer_columns)
+    if args.memory_timeline:
+        memory_timeline.to_csv(args.memory_timeline, index=False)
+    save(args, seed, {
+        "General": general_results,
+        "Shell Sort": shell_sort_results,
+        "QuickSort": quicksort_results,
+        "Merge Sort": merge_sort_results,
+    })
+    print(f"""
+-------------------------
+GENERAL RESULTS
+-------------------------
+{general_results}
+
+-------------------------
+SHELL SORT RESULTS
+-------------------------
+{shell_sort_results}
+
+-------------------------
+QUICKSORT RESULTS
+-------------------------
+{quicksort_results}
+
+-------------------------
+MERGE SORT RESULTS
+-------------------------
+{merge_sort_results}
+""")
+    return 0
+
+
+def sweep_command(args: argparse.Namespace) -> int:
+    """
+    Run the size sweep and fit the empirical complexity of each algorithm.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+
+    Returns
+    -------
+    int
+        The exit status.
+    """
+    from main import sweep_sizes
+    algorithms = select_algorithms(args.algorithm)
+    dataset_names = select_dataset_names(args.dataset) if args.dataset else list(STRUCTURED_DATASETS)
+    seed = seed_run(args.seed)
+    cache = open_cache(args)
+    sweep_results, complexity_results = sweep_sizes(args.min_size, args.max_size, args.steps, args.target_size,
+                                                    args.workers, args.pin_cpus, args.timeout, args.back_off,
+                                                    algorithms, dataset_names, cache)
+    report_cache(cache)
+    save(args, seed, {"Size Sweep": sweep_results})
+    if args.format != "table":
+        print(format_table(complexity_results, args.format))
+        return 0
+    print(f"""
+-------------------------
+SIZE SWEEP RESULTS
+-------------------------
+{sweep_results.to_string()}
+
+-------------------------
+COMPLEXITY FIT RESULTS
+-------------------------
+{complexity_results.to_string()}
+""")
+    return 0
+
+
+def compare_command(args: argparse.Namespace) -> int:
+    """
+    Compare a saved run against a baseline. Returns 1 if a regression is found, 2 if nothing is comparable.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+
+    Returns
+    -------
+    int
+        The exit status: 1 if a regression is found, 2 if the runs share no metric to compare.
+    """
+    from results_store import compare_runs
+    comparison = compare_runs(args.store, args.baseline, args.candidate, args.alpha, args.threshold)
+    if comparison.empty:
+        print(f"Nothing to compare: the candidate run shares no table, dataset, algorithm, size and metric with "
+              f"{args.baseline}.", file=sys.stderr)
+        return 2
+    regressions = comparison[comparison["Regression"]]
+    if args.format != "table":
+        print(format_table(comparison, args.format))
+    else:
+        print(f"""
+-------------------------
+REGRESSIONS AGAINST {args.baseline}
+-------------------------
+{regressions.to_string() if not regressions.empty else "None"}
+""")
+    return 1 if not regressions.empty else 0
+
+
+def batch_command(args: argparse.Namespace) -> int:
+    """
+    Measure the throughput of sorting a batch of short lists, one list at a time and all at once.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+
+    Returns
+    -------
+    int
+        The exit status.
+    """
+    from main import time_batch_throughput
+    seed = seed_run(args.seed)
+    cache = open_cache(args)
+    results = time_batch_throughput(args.lists, args.min_length, args.max_length, args.workers, args.pin_cpus,
+                                    args.timeout, args.repeats, cache)
+    report_cache(cache)
+    save(args, seed, {"Batch": results})
+    print(format_table(results, args.format))
+    return 0
+
+
+def sort_file_command(args: argparse.Namespace) -> int:
+    """
+    Sort a binary file in-place and report the bytes touched and the I/O and compute times.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+
+    Returns
+    -------
+    int
+        The exit status.
+    """
+    from file_sort import FILE_ENGINES, sort_file
+    algorithms = [name for name in select_algorithms([args.algorithm]) if name in FILE_ENGINES]
+    if not algorithms:
+        raise ValueError(f"{args.algorithm} cannot sort files. File sorts: {', '.join(FILE_ENGINES)}")
+    report = sort_file(args.path, args.dtype, algorithms[0], args.block_size)
+    print(format_table(RecordTable([{"File": args.path, "Algorithm": algorithms[0], **report}]), args.format))
+    return 0
+
+
+def sample_sort_command(args: argparse.Namespace) -> int:
+    """
+    Sample sort every selected dataset on a pool of worker processes and report the balance and phase times.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+
+    Returns
+    -------
+    int
+        The exit status.
+    """
+    from adaptive_sort import ENGINES
+    from sample_sort import SortWorkers, sample_sort
+    algorithms = [name for name in select_algorithms([args.algorithm]) if name in ENGINES]
+    if not algorithms:
+        raise ValueError(f"{args.algorithm} cannot run on the nodes. Engines: {', '.join(ENGINES)}")
+    patterns = args.dataset or ["Random", "Many Duplicates", "Uneven Distributed*"]
+    seed = seed_run(args.seed)
+    datasets = generate_datasets(select_dataset_names(patterns), args.size)
+    results = []
+    with SortWorkers(args.nodes) as workers:
+        for name, numbers in datasets.items():
+            _, report = sample_sort(numbers, workers, algorithms[0], args.oversampling, seed)
+            results.append({
+                "Dataset": name,
+                "Algorithm": algorithms[0],
+                "Size": len(numbers),
+                "Nodes": report["Workers"],
+                "Largest Bucket": max(report["Range Bucket Sizes"]),
+                "Equal Values": sum(report["Equality Bucket Sizes"]),
+                **{key: value for key, value in report.items() if key.endswith("Time (s)") or key == "Imbalance"},
+            })
+    print(format_table(RecordTable(results), args.format))
+    return 0
+
+
+def train_command(args: argparse.Namespace) -> int:
+    """
+    Train the dispatch policy of the adaptive sort and write it to a JSON file.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+
+    Returns
+    -------
+    int
+        The exit status.
+    """
+    from adaptive_sort import save_policy, train_policy
+    # The killer sequences look random to the shape probes, so training on them would steer random input away
+    # from quicksort
+    dataset_names = [name for name in select_dataset_names(args.dataset)
+                     if name != "Large Random" and name not in ADVERSARIAL_DATASETS]
+    seed_run(args.seed)
+    policy = train_policy(generate_datasets(dataset_names, args.size), args.repeats)
+    save_policy(args.output, policy)
+    for exemplar in policy:
+        print(f"{exemplar['Dataset']:<34} {exemplar['Engine']}")
+    print(f"Saved the policy to {args.output}", file=sys.stderr)
+    return 0
+
+
+def list_command(args: argparse.Namespace) -> int:
+    """
+    List the available algorithms and datasets.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+
+    Returns
+    -------
+    int
+        The exit status.
+    """
+    print("Algorithms:")
+    for algorithm in select_algorithms():
+        print(f"  {algorithm}")
+    print("Datasets:")
+    for name in ALL_DATASETS:
+        print(f"  {name}")
+    return 0
+
+
+COMMANDS = {
+    "run": run_command,
+    "suite": suite_command,
+    "sweep": sweep_command,
+    "compare": compare_command,
+    "batch": batch_command,
+    "sort-file": sort_file_command,
+    "sample-sort": sample_sort_command,
+    "train": train_command,
+    "list": list_command,
+}
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Parse the command line and run the chosen command.
+
+    Parameters
+    ----------
+    argv : list[str] | None
+        The arguments without the program name. Defaults to `sys.argv[1:]`.
+    """
+    args = build_parser().parse_args(argv)
+    try:
+        status = COMMANDS[args.command](args)
+    except ValueError as error:
+        print(f"error: {error}", file=sys.stderr)
+        status = 2
+    raise SystemExit(status)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Empirical complexity fitting for size sweeps.
+
+Each measurement series (runtime or swap count against the input size n) is fitted to the models
+c * n, c * n log n, c * n^1.25, c * n^1.5 and c * n^2. The fit is done in log space, so that the
+small sizes weigh as much as the large ones, and the model with the smallest residual is reported as
+the best fit. A free power law c * n^k is fitted alongside to report the empirical exponent k.
+"""
+from lazy_modules import lazy_import
+
+np = lazy_import("numpy")
+
+COMPLEXITY_MODELS = {
+    "O(n)": lambda n: n,
+    "O(n log n)": lambda n: n * np.log2(n),
+    "O(n^1.25)": lambda n: n ** 1.25,
+    "O(n^1.5)": lambda n: n ** 1.5,
+    "O(n^2)": lambda n: n ** 2,
+}
+
+
+def log_spaced_sizes(min_size: int, max_size: int, steps: int) -> list[int]:
+    """
+    Generate `steps` log-spaced input sizes between `min_size` and `max_size`.
+
+    Parameters
+    ----------
+    min_size : int
+    max_size : int
+    steps : int
+
+    Returns
+    -------
+    list[int]
+        The distinct sizes in increasing order.
+    """
+    sizes = np.logspace(np.log10(min_size), np.log10(max_size), steps)
+    return sorted(set(int(round(size)) for size in sizes))
+
+
+def fit_complexity(sizes: list[int], values: list[float]) -> dict:
+    """
+    Fit a measurement series to each complexity model and pick the best one.
+
+    Non-positive values (e.g. zero swaps on sorted input) cannot be fitted in log space and are ignored.
+
+    Parameters
+    ----------
+    sizes : list[int]
+        The input sizes n.
+    values : list[float]
+        The measurement at each size.
+
+    Returns
+    -------
+    dict
+        The best model name, its coefficient c and log residual, and the empirical exponent k.
+        The entries are None when fewer than two usable points remain.
+    """
+    n = np.asarray(sizes, dtype=float)
+    y = np.asarray(values, dtype=float)
+    usable = (n > 1) & (y > 0)
+    n, y = n[usable], y[usable]
+    if len(np.unique(n)) < 2:
+        return {"Model": None, "Coefficient": None, "Residual": None, "Exponent": None}
+
+    log_y = np.log(y)
+    best = None
+    for model, function in COMPLEXITY_MODELS.items():
+        log_f = np.log(function(n))
+        log_coefficient = np.mean(log_y - log_f)
+        residual = np.sqrt(np.mean((log_y - log_f - log_coefficient) ** 2))
+        if best is None or residual < best["Residual"]:
+            best = {"Model": model, "Coefficient": float(np.exp(log_coefficient)), "Residual": float(residual)}
+    exponent, _ = np.polyfit(np.log(n), log_y, 1)
+    best["Exponent"] = float(exponent)
+    return best
+
+
+def extrapolate(fit: dict, size: int) -> float | None:
+    """
+    Predict the measurement at `size` from a fit returned by `fit_complexity`.
+
+    Parameters
+    ----------
+    fit : dict
+    size : int
+
+    Returns
+    -------
+    float | None
+        The predicted value, or None if the series could not be fitted.
+    """
+    if fit["Model"] is None:
+        return None
+    return float(fit["Coefficient"] * COMPLEXITY_MODELS[fit["Model"]](float(size)))
+
+
+if __name__ == "__main__":
+    # Test that synthetic linear and quadratic series are recognised and extrapolated
+    test_sizes = log_spaced_sizes(1000, 100000, 6)
+    assert test_sizes == sorted(test_sizes) and test_sizes[0] == 1000 and test_sizes[-1] == 100000
+    assert log_spaced_sizes(10, 10, 5) == [10] and len(log_spaced_sizes(1, 3, 10)) == 3
+
+    linear_fit = fit_complexity(test_sizes, [2e-6 * size for size in test_sizes])
+    assert linear_fit["Model"] == "O(n)" and abs(linear_fit["Exponent"] - 1) < 1e-9
+    assert abs(extrapolate(linear_fit, 10 ** 6) - 2.0) < 1e-9
+    quadratic_fit = fit_complexity(test_sizes, [3e-9 * size ** 2 * (1.02 if index % 2 else 0.98)
+                                                for index, size in enumerate(test_sizes)])
+    assert quadratic_fit["Model"] == "O(n^2)" and abs(quadratic_fit["Exponent"] - 2) < 0.05
+    assert fit_complexity(test_sizes, [size * np.log2(size) for size in test_sizes])["Model"] == "O(n log n)"
+
+    # Series with fewer than two usable sizes cannot be fitted
+    unfitted = fit_complexity([1000, 1000, 2000], [1.0, 2.0, 0.0])
+    assert unfitted["Model"] is None and extrapolate(unfitted, 10 ** 6) is None
+    assert fit_complexity([], [])["Exponent"] is None
+    print("All tests passed!")
@@ -77,6 +77,8 @@ Extra Datasets to measure edge cases:
     2) List of odd integers
     3) List of duplicates of 1 integer
     4) List of duplicates of multiple integers
+    5) Killer sequences against the midpoint, median-of-three and ninther pivot rules, built by McIlroy's
+       adversary, which make those quicksorts run in O(n^2)
 
 
 
@@ -96,9 +98,54 @@ Extra Datasets to measure edge cases:
                                     Generate general-purpose datasets
                                     ---------------------------------
 """
-import numpy as np
+import fnmatch
+import functools
 import random
+import sys
 
+from lazy_modules import lazy_import
+from quicksort import quicksort
+
+np = lazy_import("numpy")
+
+
+# Seed every random number generator used by the dataset generators
+def seed_datasets(seed: int) -> None:
+    """
+    Seed the random number generators used by the dataset generators, so the datasets can be reproduced.
+
+    Parameters
+    ----------
+    seed : int
+    """
+    np.random.seed(seed)
+    random.seed(seed)
+
+
+# Structured datasets for characteristic testing, by name
+STRUCTURED_DATASETS = {
+    "Random": lambda size: np.random.randint(0, 1000, size).tolist(),
+    "Nearly Sorted": lambda size: (np.sort(np.random.randint(0, 1000, size)) + np.random.randint(-3, 3, size)).tolist(),
+    "Reverse Sorted": lambda size: np.sort(np.random.randint(0, 1000, size))[::-1].tolist(),
+    "Many Duplicates": lambda size: np.random.choice([5, 10, 15, 20], size=size, replace=True).tolist(),
+    "Even Distributed": lambda size: np.linspace(0, 1000, size, dtype=int).tolist(),
+    "Uneven Distributed (Front Heavy)": lambda size: np.concatenate([
+        np.random.randint(900, 1000, size // 2),
+        np.random.randint(0, 100, size - size // 2)
+    ]).tolist(),
+    "Uneven Distributed (End Heavy)": lambda size: np.concatenate([
+        np.random.randint(0, 100, size // 2),
+        np.random.randint(900, 1000, size - size // 2)
+    ]).tolist(),
+    "Sorted with Indices Swapped": lambda size: generate_sorted_with_random_indices_swapped(size),
+    "Exponentially Growing": lambda size: generate_exponentially_growing_dataset(size),
+    "Fractal": lambda size: generate_fractal_dataset(size),
+    "Sorted in Groups": lambda size: generate_sorted_in_groups(size),
+    "Evens": lambda size: generate_list_of_evens(size),
+    "Odds": lambda size: generate_list_of_odds(size),
+    "One Duplicate": lambda size: generate_list_of_duplicates_of_one(size),
+    "Multiple Duplicates": lambda size: generate_list_of_duplicates_of_multiple(size, num_duplicates=10)
+}
 
 # Generate structured datasets for characteristic testing
 def generate_structured_datasets(size: int) -> dict[str, list]:
@@ -113,30 +160,7 @@ def generate_structured_datasets(size: int) -> dict[str, list]:
     -------
     dict[str, list]
     """
-    half = size // 2
-    return {
-        "Random": np.random.randint(0, 1000, size).tolist(),
-        "Nearly Sorted": (np.sort(np.random.randint(0, 1000, size)) + np.random.randint(-3, 3, size)).tolist(),
-        "Reverse Sorted": np.sort(np.random.randint(0, 1000, size))[::-1].tolist(),
-        "Many Duplicates": np.random.choice([5, 10, 15, 20], size=size, replace=True).tolist(),
-        "Even Distributed": np.linspace(0, 1000, size, dtype=int).tolist(),
-        "Uneven Distributed (Front Heavy)": np.concatenate([
-            np.random.randint(900, 1000, half),
-            np.random.randint(0, 100, size - half)
-        ]).tolist(),
-        "Uneven Distributed (End Heavy)": np.concatenate([
-            np.random.randint(0, 100, half),
-            np.random.randint(900, 1000, size - half)
-        ]).tolist(),
-        "Sorted with Indices Swapped": generate_sorted_with_random_indices_swapped(size),
-        "Exponentially Growing": generate_exponentially_growing_dataset(size),
-        "Fractal": generate_fractal_dataset(size),
-        "Sorted in Groups": generate_sorted_in_groups(size),
-        "Evens": generate_list_of_evens(size),
-        "Odds": generate_list_of_odds(size),
-        "One Duplicate": generate_list_of_duplicates_of_one(size),
-        "Multiple Duplicates": generate_list_of_duplicates_of_multiple(size, num_duplicates=10)
-    }
+    return {name: generate(size) for name, generate in STRUCTURED_DATASETS.items()}
 
 # Generate large scale random dataset for scalability testing
 def generate_large_random_dataset(size: int) -> dict[str, list]:
@@ -162,6 +186,12 @@ def generate_large_random_dataset(size: int) -> dict[str, list]:
 """
 
 
+SHELL_SORT_DATASETS = {
+    "Evenly distributed": lambda size: generate_evenly_distributed(size),
+    "Unevenly distributed": lambda size: generate_unevenly_distributed(size),
+    "Partly ordered": lambda size: generate_partly_ordered(size)
+}
+
 def generate_shell_sort_datasets(size: int) -> dict[str, list]:
     """
     Create datasets specifically for testing the shell sort algorithm.
@@ -174,12 +204,7 @@ def generate_shell_sort_datasets(size: int) -> dict[str, list]:
     -------
     dict[str, list]
     """
-    datasets = {
-        "Evenly distributed": generate_evenly_distributed(size),
-        "Unevenly distributed": generate_unevenly_distributed(size),
-        "Partly ordered": generate_partly_ordered(size)
-    }
-    return datasets
+    return {name: generate(size) for name, generate in SHELL_SORT_DATASETS.items()}
 
 
 # Define function to generate an evenly_distributed dataset for Shell Sort
@@ -422,13 +447,173 @@ def generate_list_of_duplicates_of_multiple(size: int, num_duplicates: int) -> l
                     ----------------------------------------------
 """
 
+class GasAdversary:
+    """
+    McIlroy's adversary for comparison sorts ("A Killer Adversary for Quicksort", 1999).
+
+    Every value starts out as "gas", larger than any value fixed so far and not yet ordered against other gas.
+    When the sort compares two gas values, the adversary freezes one of them to the next smallest value: the one
+    it guesses to be the pivot, i.e. the gas value that took part in the latest comparison. A quicksort keeps
+    comparing its pivot with the rest of the segment, so the pivot ends up as the smallest value of its segment
+    and every partition splits off a single value.
+
+    Parameters
+    ----------
+    size : int
+        The number of values.
+
+    Attributes
+    ----------
+    values : list[int]
+        The value at every position of the input; the values still gas are `size`.
+    comparisons : int
+        The number of comparisons the sort has made.
+    """
+    __slots__ = ("gas", "values", "solid", "candidate", "comparisons")
+
+    def __init__(self, size: int):
+        self.gas = size
+        self.values = [size] * size
+        self.solid = 0
+        self.candidate = 0
+        self.comparisons = 0
+
+    def compare(self, x: int, y: int) -> int:
+        """
+        Compare the values at input positions x and y, fixing gas values as needed.
+
+        Parameters
+        ----------
+        x : int
+        y : int
+
+        Returns
+        -------
+        int
+            Negative, zero or positive as the value at x is smaller than, equal to or larger than the value at y.
+        """
+        self.comparisons += 1
+        values = self.values
+        if values[x] == self.gas and values[y] == self.gas:
+            values[x if x == self.candidate else y] = self.solid
+            self.solid += 1
+        if values[x] == self.gas:
+            self.candidate = x
+        elif values[y] == self.gas:
+            self.candidate = y
+        return values[x] - values[y]
+
+
+class AdversaryItem:
+    """
+    An element handed to the sort under attack, which compares through the adversary.
+
+    Parameters
+    ----------
+    adversary : GasAdversary
+    index : int
+        The input position of the element.
+    """
+    __slots__ = ("adversary", "index")
+
+    def __init__(self, adversary: GasAdversary, index: int):
+        self.adversary = adversary
+        self.index = index
+
+    def __lt__(self, other):
+        return self.adversary.compare(self.index, other.index) < 0
+
+    def __le__(self, other):
+        return self.adversary.compare(self.index, other.index) <= 0
+
+    def __gt__(self, other):
+        return self.adversary.compare(self.index, other.index) > 0
+
+    def __ge__(self, other):
+        return self.adversary.compare(self.index, other.index) >= 0
+
+
+def generate_adversarial(size: int, sort_function) -> list[int]:
+    """
+    Build a killer input against a comparison sort by running it against McIlroy's gas adversary.
+
+    The sort must be deterministic: the input it gets afterwards is the one the adversary made up while it ran,
+    so sorting that input replays the same comparisons.
+
+    Parameters
+    ----------
+    size : int
+    sort_function : callable
+        Sorts a list in-place using only comparisons between its elements, e.g.
+        `lambda items: quicksort(items, 0, len(items) - 1, count=False)` or `list.sort`.
+
+    Returns
+    -------
+    list[int]
+        The killer input.
+    """
+    adversary = GasAdversary(size)
+    items = [AdversaryItem(adversary, index) for index in range(size)]
+    # A quicksort driven into O(n^2) also recurses O(n) deep
+    recursion_limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(recursion_limit, size + 1000))
+    try:
+        sort_function(items)
+    finally:
+        sys.setrecursionlimit(recursion_limit)
+    return adversary.values
+
+
+@functools.lru_cache(maxsize=None)
+def _quicksort_killer(size: int, pivot_rule: str) -> tuple[int, ...]:
+    return tuple(generate_adversarial(size, lambda items: quicksort(items, 0, len(items) - 1, count=False,
+                                                                        pivot_rule=pivot_rule)))
+
+
+def generate_quicksort_killer(size: int, pivot_rule: str = "Midpoint") -> list[int]:
+    """
+    Build a killer input against our quicksort with the given pivot rule.
+
+    Sorting it with that pivot rule makes O(n^2) comparisons and recurses O(n) deep, so it needs a recursion
+    limit above `size`. The midpoint killer is also a killer for the median-of-three rule. Building a killer
+    takes as long as the quadratic sort it provokes, so every (size, pivot rule) is built once per process.
+
+    Parameters
+    ----------
+    size : int
+    pivot_rule : str
+        A key of `quicksort.PIVOT_RULES`.
+
+    Returns
+    -------
+    list[int]
+    """
+    return list(_quicksort_killer(size, pivot_rule))
+
+
+# Killer sequences are built in the parent process, outside the time budget of the cells, and building one
+# is quadratic, so they are never longer than this (about a second each)
+ADVERSARIAL_MAX_SIZE = 3000
+
+# Killer sequences against each pivot rule, capped at `ADVERSARIAL_MAX_SIZE`. They are only selected by
+# patterns that name them (see `select_dataset_names`).
+ADVERSARIAL_DATASETS = {
+    "Midpoint Killer": lambda size: generate_quicksort_killer(min(size, ADVERSARIAL_MAX_SIZE), "Midpoint"),
+    "Median of Three Killer": lambda size: generate_quicksort_killer(min(size, ADVERSARIAL_MAX_SIZE),
+                                                                     "Median of Three"),
+    "Ninther Killer": lambda size: generate_quicksort_killer(min(size, ADVERSARIAL_MAX_SIZE), "Ninther"),
+}
+
+QUICKSORT_DATASETS = {
+    "Evens": lambda size: generate_list_of_evens(size),
+    "Odds": lambda size: generate_list_of_odds(size),
+    "Duplicates of One": lambda size: generate_list_of_duplicates_of_one(size),
+    "Multiple Duplicates": lambda size: generate_list_of_duplicates_of_multiple(size, num_duplicates=10),
+    **ADVERSARIAL_DATASETS,
+}
+
 def generate_quicksort_datasets(size: int) -> dict[str, list]:
-    return {
-        "Evens": generate_list_of_evens(size),
-        "Odds": generate_list_of_odds(size),
-        "Duplicates of One": generate_list_of_duplicates_of_one(size),
-        "Multiple Duplicates": generate_list_of_duplicates_of_multiple(size, num_duplicates=10)
-    }
+    return {name: generate(size) for name, generate in QUICKSORT_DATASETS.items()}
 
 """
                     -------------------------------------
@@ -436,16 +621,18 @@ def generate_quicksort_datasets(size: int) -> dict[str, list]:
                     -------------------------------------
 """
 
+MERGE_SORT_DATASETS = {
+    "Empty List": lambda size: [],
+    "Single Value": lambda size: generate_single_value_dataset(),
+    "Uniform List": lambda size: generate_uniform_dataset(size),
+    "Mixed -/+ List": lambda size: generate_mixed_neg_pos_dataset(size),
+    "Sorted + Rotated List": lambda size: generate_sorted_rotated_dataset(size),
+    "Float List": lambda size: generate_random_float_dataset(size),
+    "Periodic Pattern": lambda size: generate_periodic_pattern_dataset(size)
+}
+
 def generate_merge_sort_datasets(size: int) -> dict[str, list]:
-    return {
-        "Empty List": [],
-        "Single Value": generate_single_value_dataset(),
-        "Uniform List": generate_uniform_dataset(size),
-        "Mixed -/+ List": generate_mixed_neg_pos_dataset(size),
-        "Sorted + Rotated List": generate_sorted_rotated_dataset(size),
-        "Float List": generate_random_float_dataset(size),
-        "Periodic Pattern": generate_periodic_pattern_dataset(size)
-    }
+    return {name: generate(size) for name, generate in MERGE_SORT_DATASETS.items()}
 
 def generate_single_value_dataset() -> list[int]:
     """
@@ -544,4 +731,111 @@ def generate_periodic_pattern_dataset(size: int) -> list[int]:
     """
     pattern = [1, 2, 3]
     repeated = (pattern * ((size // len(pattern)) + 1))[:size]
-    return repeated
\ No newline at end of file
+    return repeated
+
+
+"""
+                    ----------------------------------
+                    Generate batches of short lists
+                    ----------------------------------
+"""
+
+
+def generate_ragged_lists(count: int, min_length: int = 10, max_length: int = 500, high: int = 1000) -> list[list[int]]:
+    """
+    Generate a batch of random lists of random lengths, for the batch throughput benchmark.
+
+    Parameters
+    ----------
+    count : int
+        The number of lists.
+    min_length : int
+        The shortest list length.
+    max_length : int
+        The longest list length.
+    high : int
+        The upper bound of the values (exclusive).
+
+    Returns
+    -------
+    list[list[int]]
+    """
+    lengths = np.random.randint(min_length, max_length + 1, count)
+    return [np.random.randint(0, high, length).tolist() for length in lengths]
+
+
+"""
+                    ----------------------------------
+                    Select datasets by name or pattern
+                    ----------------------------------
+"""
+
+# Every dataset by name, across the general-purpose and algorithm-specific groups
+ALL_DATASETS = {
+    **STRUCTURED_DATASETS,
+    "Large Random": lambda size: np.random.randint(0, 1_000_000, size).tolist(),
+    **SHELL_SORT_DATASETS,
+    **QUICKSORT_DATASETS,
+    **MERGE_SORT_DATASETS,
+}
+
+
+def select_dataset_names(patterns: list[str] | None = None) -> list[str]:
+    """
+    Select dataset names matching any of the given names or glob patterns (case-insensitive).
+
+    The adversarial datasets are left out unless a pattern that mentions "killer" selects them, e.g.
+    "Ninther Killer" or "*killer*", so broad patterns such as "*" do not pay for building them.
+
+    Parameters
+    ----------
+    patterns : list[str] | None
+        Names or glob patterns such as "Fractal" or "*sorted*". All datasets but the adversarial ones are
+        selected if None.
+
+    Returns
+    -------
+    list[str]
+        The matching dataset names, in registry order.
+    """
+    if not patterns:
+        return [name for name in ALL_DATASETS if name not in ADVERSARIAL_DATASETS]
+    names = [name for name in ALL_DATASETS
+             if any(fnmatch.fnmatch(name.lower(), pattern.lower())
+                    and (name not in ADVERSARIAL_DATASETS or "killer" in pattern.lower()) for pattern in patterns)]
+    if not names:
+        raise ValueError(f"No dataset matches {patterns}. Available datasets: {', '.join(ALL_DATASETS)}")
+    return names
+
+
+def generate_datasets(names: list[str], size: int) -> dict[str, list]:
+    """
+    Generate only the named datasets at the given size.
+
+    Parameters
+    ----------
+    names : list[str]
+        Keys of `ALL_DATASETS`.
+    size : int
+
+    Returns
+    -------
+    dict[str, list]
+    """
+    return {name: ALL_DATASETS[name](size) for name in names}
+
+
+if __name__ == "__main__":
+    # Test that the killer sequences drive their quicksort into O(n^2) comparisons
+    from instrumentation import Probe
+
+    sys.setrecursionlimit(10_000)
+    for test_rule in ("Midpoint", "Median of Three", "Ninther"):
+        test_killer = generate_quicksort_killer(1000, test_rule)
+        assert len(test_killer) == 1000 and 0 <= min(test_killer) <= max(test_killer) <= 1000
+        killer_probe, random_probe = Probe(), Probe()
+        quicksort(list(test_killer), 0, 999, probe=killer_probe, pivot_rule=test_rule)
+        quicksort(random.sample(range(1000), 1000), 0, 999, probe=random_probe, pivot_rule=test_rule)
+        assert killer_probe.comparisons > 5 * random_probe.comparisons
+    assert len(generate_adversarial(100, list.sort)) == 100
+    print("All tests passed!")
@@ -0,0 +1,270 @@
+"""
+In-place sorting of memory-mapped binary files.
+
+A flat file of int64 or float64 values is mapped into memory with `mmap` and viewed as typed values through a
+`memoryview`, which quicksort, shell sort and the in-place merge sort index like a list. The values are read
+from and written back to the page cache directly, one at a time, so the file is never copied into a list of
+Python objects. A `np.memmap` (or any contiguous array) can be sorted the same way with `sort_array`; arrays
+of non-native byte order (e.g. '>i8' on x86) are byte-swapped in place around the sort, since a memoryview
+cannot index them.
+
+The mapping is advised with the access pattern of the chosen sort: quicksort scans its partitions from both
+ends, merge sort streams through its runs, and shell sort's insertion passes stride across the whole file.
+With `block_size`, the file is sorted in blocks that fit in the CPU caches, each block with the chosen sort,
+and the sorted blocks are then merged pairwise in place, which turns the access pattern into a sequential one.
+
+The report splits the wall time into I/O (mapping, reading every page in before the sort and writing back) and
+compute (sorting), and estimates the bytes touched from the page faults taken by the process. The split is
+exact only when the file fits in memory; otherwise pages read in early are evicted again during the sort.
+"""
+import mmap
+import os
+import struct
+import time
+
+from merge_sort import merge_in_place, merge_sort
+from quicksort import quicksort
+from shell_sort import shell_sort
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# memoryview format codes of the supported value types
+DTYPE_CODES = {"int64": "q", "float64": "d", "int32": "i", "float32": "f"}
+
+# Sorts that work on a memoryview in-place. Merge sort runs buffer-free, so no run is copied out of the file.
+FILE_ENGINES = {
+    "QuickSort": lambda view: quicksort(view, 0, len(view) - 1, count=False),
+    "MergeSort": lambda view: merge_sort(view, 0, len(view) - 1, count=False, in_place=True),
+    "Shell Sort": lambda view: shell_sort(view, count=False),
+}
+
+# The madvise hint matching the access pattern of each sort
+ACCESS_ADVICE = {
+    "QuickSort": "MADV_NORMAL",
+    "MergeSort": "MADV_SEQUENTIAL",
+    "Shell Sort": "MADV_RANDOM",
+}
+
+
+def advise(mapping: mmap.mmap, advice: str) -> None:
+    """
+    Pass an madvise hint to the kernel, if the platform supports it.
+
+    Parameters
+    ----------
+    mapping : mmap.mmap
+    advice : str
+        The name of an `mmap.MADV_*` constant, e.g. "MADV_SEQUENTIAL".
+    """
+    if hasattr(mapping, "madvise") and hasattr(mmap, advice):
+        mapping.madvise(getattr(mmap, advice))
+
+
+def page_faults() -> tuple[int, int]:
+    """
+    Read the minor and major page faults taken by this process so far.
+
+    Returns
+    -------
+    tuple[int, int]
+        The minor and major page fault counts, or zeros where `resource` is unavailable.
+    """
+    if resource is None:
+        return 0, 0
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_minflt, usage.ru_majflt
+
+
+def touch_pages(mapping: mmap.mmap, chunk_size: int = 1 << 20) -> None:
+    """
+    Read a whole mapping, so that its pages are in memory before it is sorted.
+
+    MADV_WILLNEED only starts the read-ahead and returns at once, so without this the disk reads would be
+    paid for inside the sort.
+
+    Parameters
+    ----------
+    mapping : mmap.mmap
+    chunk_size : int
+        The number of bytes read at a time.
+    """
+    for start_index in range(0, len(mapping), chunk_size):
+        mapping[start_index:start_index + chunk_size]
+
+
+def sort_view(view: memoryview, algorithm: str = "QuickSort", block_size: int | None = None) -> int:
+    """
+    Sort the values of a memoryview in-place.
+
+    Parameters
+    ----------
+    view : memoryview
+        A one-dimensional typed view, e.g. of a memory-mapped file.
+    algorithm : str
+        A key of `FILE_ENGINES`.
+    block_size : int | None
+        Sort blocks of this many values first, then merge the sorted blocks pairwise in place. The whole view is
+        sorted at once if None.
+
+    Returns
+    -------
+    int
+        The number of blocks sorted.
+    """
+    sort_function = FILE_ENGINES[algorithm]
+    size = len(view)
+    if block_size is None or block_size >= size:
+        sort_function(view)
+        return 1
+    # Slices of a memoryview share its memory, so every block is sorted where it lies
+    for start_index in range(0, size, block_size):
+        sort_function(view[start_index:start_index + block_size])
+    width = block_size
+    while width < size:
+        for start_index in range(0, size - width, 2 * width):
+            merge_in_place(view, start_index, start_index + width - 1, min(start_index + 2 * width, size) - 1)
+        width *= 2
+    return -(-size // block_size)
+
+
+def sort_array(values, algorithm: str = "QuickSort", block_size: int | None = None) -> int:
+    """
+    Sort a contiguous one-dimensional array, such as a `np.memmap`, in-place.
+
+    Parameters
+    ----------
+    values : np.ndarray | np.memmap | array.array
+        Any object exposing a contiguous one-dimensional buffer of numbers. NumPy arrays of non-native byte
+        order are byte-swapped in place, sorted, and swapped back.
+    algorithm : str
+        A key of `FILE_ENGINES`.
+    block_size : int | None
+        See `sort_view`.
+
+    Returns
+    -------
+    int
+        The number of blocks sorted.
+
+    Raises
+    ------
+    ValueError
+        If the buffer is not one-dimensional or holds values a memoryview cannot index.
+    """
+    dtype = getattr(values, "dtype", None)
+    if dtype is not None and not dtype.isnative:
+        native = values.view(dtype.newbyteorder("="))
+        native.byteswap(inplace=True)
+        try:
+            return sort_array(native, algorithm, block_size)
+        finally:
+            native.byteswap(inplace=True)
+    with memoryview(values) as view:
+        if view.ndim != 1:
+            raise ValueError(f"sort_array sorts one-dimensional buffers, not buffers of shape {view.shape}.")
+        if len(view):
+            try:
+                view[0]
+            except NotImplementedError:
+                raise ValueError(f"sort_array cannot index values of format {view.format!r}; convert them to "
+                                 f"native byte order first.") from None
+        return sort_view(view, algorithm, block_size)
+
+
+def sort_file(path: str, dtype: str = "int64", algorithm: str = "QuickSort", block_size: int | None = None) -> dict:
+    """
+    Sort a flat binary file of numbers in-place through a memory mapping.
+
+    Parameters
+    ----------
+    path : str
+        The file to sort, holding native-endian values of `dtype` back to back.
+    dtype : str
+        A key of `DTYPE_CODES`.
+    algorithm : str
+        A key of `FILE_ENGINES`.
+    block_size : int | None
+        See `sort_view`.
+
+    Returns
+    -------
+    dict
+        The number of values and blocks, the I/O and compute times in seconds, the bytes touched (page faults
+        times the page size) and the major page faults, which had to wait for the disk.
+    """
+    if dtype not in DTYPE_CODES:
+        raise ValueError(f"Unsupported dtype {dtype!r}. Supported dtypes: {', '.join(DTYPE_CODES)}")
+    if algorithm not in FILE_ENGINES:
+        raise ValueError(f"Unsupported algorithm {algorithm!r}. File sorts: {', '.join(FILE_ENGINES)}")
+    minor_before, major_before = page_faults()
+    start = time.perf_counter()
+    blocks = 0
+    compute_time = 0.0
+    with open(path, "r+b") as file:
+        size = os.fstat(file.fileno()).st_size
+        item_size = struct.calcsize(DTYPE_CODES[dtype])
+        if size % item_size:
+            raise ValueError(f"{path} holds {size} bytes, which is not a whole number of {dtype} values.")
+        if size:
+            with mmap.mmap(file.fileno(), 0) as mapping:
+                advise(mapping, "MADV_WILLNEED")
+                touch_pages(mapping)
+                advise(mapping, "MADV_SEQUENTIAL" if block_size else ACCESS_ADVICE[algorithm])
+                with memoryview(mapping) as raw, raw.cast(DTYPE_CODES[dtype]) as view:
+                    compute_start = time.perf_counter()
+                    blocks = sort_view(view, algorithm, block_size)
+                    compute_time = time.perf_counter() - compute_start
+                mapping.flush()
+    minor_after, major_after = page_faults()
+    return {
+        "Values": size // item_size,
+        "Blocks": blocks,
+        "I/O Time (s)": time.perf_counter() - start - compute_time,
+        "Compute Time (s)": compute_time,
+        "Bytes Touched": (minor_after - minor_before + major_after - major_before) * mmap.PAGESIZE,
+        "Major Page Faults": major_after - major_before,
+    }
+
+
+if __name__ == "__main__":
+    # Test sorting a memory-mapped file in-place
+    import array
+    import random
+    import tempfile
+
+    for test_algorithm in FILE_ENGINES:
+        for test_block_size in (None, 100):
+            test_values = array.array("q", [random.randint(-1000, 1000) for _ in range(1000)])
+            with tempfile.NamedTemporaryFile(suffix=".bin", delete=False) as test_file:
+                test_file.write(test_values.tobytes())
+            report = sort_file(test_file.name, "int64", test_algorithm, test_block_size)
+            with open(test_file.name, "rb") as test_file:
+                sorted_values = array.array("q", test_file.read())
+            os.remove(test_file.name)
+            assert list(sorted_values) == sorted(test_values) and report["Values"] == 1000
+    test_floats = array.array("d", [random.random() for _ in range(500)])
+    sort_array(test_floats, "MergeSort", 64)
+    assert list(test_floats) == sorted(test_floats)
+
+    # Test sorting a big-endian memmap in place, which stays big-endian
+    import numpy as np
+
+    with tempfile.TemporaryDirectory() as test_directory:
+        test_path = os.path.join(test_directory, "big_endian.bin")
+        test_big_endian = np.array([random.randint(-1000, 1000) for _ in range(300)], dtype=">i8")
+        test_big_endian.tofile(test_path)
+        test_memmap = np.memmap(test_path, dtype=">i8", mode="r+")
+        sort_array(test_memmap, "QuickSort")
+        test_memmap.flush()
+        del test_memmap
+        assert np.fromfile(test_path, dtype=">i8").tolist() == sorted(test_big_endian.tolist())
+    try:
+        sort_array(np.zeros((2, 2)))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("2D arrays must be rejected")
+    print("All tests passed!")
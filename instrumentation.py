@@ -0,0 +1,174 @@
+"""
+Instrumentation shared by quicksort.py, merge_sort.py and shell_sort.py.
+
+Passing a `Probe` to `quicksort`, `merge_sort` or `shell_sort` runs a probed variant of the sort, which
+records comparisons, element moves, recursion depth, the balance of every quicksort partition and the
+time spent in each phase of the sort. Without a probe the regular variants run, which contain no hooks,
+so the instrumentation costs nothing when it is disabled.
+
+`profile_call` wraps any call in cProfile and dumps the pstats to a file.
+"""
+import cProfile
+
+PARTITION_BALANCE_BUCKETS = 10
+
+
+class Probe:
+    """
+    Counters and phase timers filled in by the probed sort variants.
+
+    Attributes
+    ----------
+    comparisons : int
+        The number of element comparisons.
+    moves : int
+        The number of element writes (a swap counts as two).
+    max_depth : int
+        The deepest recursion level reached.
+    partition_balance : list[int]
+        A histogram of the left / (left + right) split ratios of the quicksort partitions, in
+        `PARTITION_BALANCE_BUCKETS` equal-width buckets from 0 to 1.
+    phase_times : dict[str, float]
+        The time spent in each phase of the sort in seconds, e.g. "partition" or "merge".
+    """
+
+    def __init__(self):
+        self.comparisons = 0
+        self.moves = 0
+        self.max_depth = 0
+        self.partition_balance = [0] * PARTITION_BALANCE_BUCKETS
+        self.phase_times = {}
+        self._balance_total = 0.0
+
+    def enter(self, depth: int) -> None:
+        """
+        Record that the sort has reached recursion level `depth`.
+
+        Parameters
+        ----------
+        depth : int
+        """
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def record_partition(self, left_size: int, right_size: int) -> None:
+        """
+        Record the sizes of the two sides of a partition.
+
+        Parameters
+        ----------
+        left_size : int
+        right_size : int
+        """
+        ratio = left_size / (left_size + right_size)
+        self.partition_balance[min(int(ratio * PARTITION_BALANCE_BUCKETS), PARTITION_BALANCE_BUCKETS - 1)] += 1
+        self._balance_total += min(left_size, right_size) / (left_size + right_size)
+
+    def add_time(self, phase: str, seconds: float) -> None:
+        """
+        Add `seconds` to the time spent in `phase`.
+
+        Parameters
+        ----------
+        phase : str
+        seconds : float
+        """
+        self.phase_times[phase] = self.phase_times.get(phase, 0.0) + seconds
+
+    def report(self) -> dict:
+        """
+        Summarize the recorded counters.
+
+        The mean partition balance is the mean of min(left, right) / (left + right) over all partitions:
+        0.5 means every pivot split its segment in half, values near 0 mean the pivot choice degrades
+        quicksort towards O(n^2).
+
+        Returns
+        -------
+        dict
+        """
+        partitions = sum(self.partition_balance)
+        report = {
+            "Comparisons": self.comparisons,
+            "Moves": self.moves,
+            "Max Recursion Depth": self.max_depth,
+            "Partitions": partitions,
+            "Mean Partition Balance": self._balance_total / partitions if partitions else None,
+            "Partition Balance Histogram": list(self.partition_balance),
+        }
+        for phase, seconds in self.phase_times.items():
+            report[f"{phase.capitalize()} Time (s)"] = seconds
+        return report
+
+
+def profile_call(path: str, function, *arguments):
+    """
+    Call `function(*arguments)` under cProfile and dump the pstats to `path`.
+
+    Parameters
+    ----------
+    path : str
+        The file to write the pstats to. Read it with `pstats.Stats(path)`.
+    function : callable
+    *arguments
+        The positional arguments for `function`.
+
+    Returns
+    -------
+    object
+        The return value of `function`.
+    """
+    profiler = cProfile.Profile()
+    result = profiler.runcall(function, *arguments)
+    profiler.dump_stats(path)
+    return result
+
+
+if __name__ == "__main__":
+    # Test that the probed sorts report the counts of the counted sorts, and the profiler round trip
+    import os
+    import pstats
+    import random
+    import tempfile
+
+    from merge_sort import merge_sort
+    from quicksort import quicksort
+    from shell_sort import shell_sort
+
+    test_numbers = [random.randint(0, 1000) for _ in range(2000)]
+    test_sorts = {
+        "QuickSort": (lambda numbers, probe=None: quicksort(numbers, 0, len(numbers) - 1, probe=probe), "partition"),
+        "MergeSort": (lambda numbers, probe=None: merge_sort(numbers, 0, len(numbers) - 1, probe=probe), "merge"),
+        "Shell Sort": (lambda numbers, probe=None: shell_sort(numbers, probe=probe), "gap pass"),
+    }
+    for test_name, (test_sort, test_phase) in test_sorts.items():
+        counted = list(test_numbers)
+        probed = list(test_numbers)
+        test_probe = Probe()
+        assert test_sort(probed, test_probe) == test_sort(counted) and probed == counted == sorted(test_numbers)
+        test_report = test_probe.report()
+        assert test_report["Comparisons"] > 0 and test_report["Moves"] > 0
+        assert test_report["Partition Balance Histogram"] == test_probe.partition_balance
+        assert sum(test_probe.partition_balance) == test_report["Partitions"]
+        assert test_probe.phase_times[test_phase] > 0
+    # Shell sort, sorted last, makes no partitions
+    assert test_report["Partitions"] == 0 and test_report["Mean Partition Balance"] is None
+
+    # A quicksort of n distinct values makes at least n - 1 partitions, each at some recursion level
+    test_probe = Probe()
+    quicksort(list(range(1000))[::-1], 0, 999, probe=test_probe)
+    assert test_probe.report()["Partitions"] == sum(test_probe.partition_balance) >= 999
+    assert 10 <= test_probe.max_depth < 1000 and 0 < test_probe.report()["Mean Partition Balance"] <= 0.5
+
+    test_probe = Probe()
+    test_probe.record_partition(1, 3)
+    test_probe.record_partition(5, 5)
+    test_probe.record_partition(9, 0)
+    assert test_probe.partition_balance == [0, 0, 1, 0, 0, 1, 0, 0, 0, 1]
+    assert abs(test_probe.report()["Mean Partition Balance"] - (0.25 + 0.5 + 0) / 3) < 1e-12
+
+    with tempfile.TemporaryDirectory() as test_directory:
+        test_path = os.path.join(test_directory, "sort.pstats")
+        assert profile_call(test_path, sorted, [3, 1, 2]) == [1, 2, 3]
+        assert pstats.Stats(test_path).total_calls > 0
+    print("All tests passed!")
@@ -0,0 +1,152 @@
+"""
+Key-function sorting and argsort for records.
+
+The sorts in this project compare their elements directly, so sorting records (e.g. order-book rows by price,
+then timestamp) would compare tuples or objects in every inner loop. `sort_records` and `argsort` instead
+decorate each record once: the key of every record is computed once, every component of the key is replaced
+by its rank among the values of that component (with NumPy), and the ranks and the position of the record are
+packed into one integer
+
+    code = ((rank_0 * count_1 + rank_1) * count_2 + ...) * n + position
+
+so the engine sorts plain ints, which costs about the same as sorting any other list of ints. The position in
+the code breaks ties between equal keys, so every engine sorts stably, and the permutation is read back from
+the sorted codes with `code % n`.
+"""
+import numpy as np
+
+from adaptive_sort import ENGINES
+
+
+def rank_component(component: list) -> tuple[np.ndarray, int]:
+    """
+    Rank the values of one key component, equal values sharing a rank.
+
+    NumPy converts ints to float64 when they are mixed with floats or do not fit in int64, which rounds ints
+    beyond 2**53 (e.g. 2**60 + 1 and 2**60 become equal). Such components are ranked with Python's exact
+    comparisons instead.
+
+    Parameters
+    ----------
+    component : list
+
+    Returns
+    -------
+    tuple[np.ndarray, int]
+        The rank of every value and the number of distinct values.
+    """
+    values = np.asarray(component)
+    if values.dtype.kind == "f" and any(isinstance(value, (int, np.integer)) for value in component):
+        distinct = {value: rank for rank, value in enumerate(sorted(set(component)))}
+        return np.array([distinct[value] for value in component], dtype=np.int64), len(distinct)
+    if values.ndim != 1:
+        # Nested sequences are compared as whole objects
+        values = np.empty(len(component), dtype=object)
+        values[:] = component
+    distinct, inverse = np.unique(values, return_inverse=True)
+    return inverse.reshape(-1), len(distinct)
+
+
+def rank_keys(keys: list) -> list[int]:
+    """
+    Pack the keys and their positions into integers that sort like (key, position).
+
+    Parameters
+    ----------
+    keys : list
+        One key per record: a number, a string or any other orderable value, or a tuple of them.
+        Tuple keys must all have the same length.
+
+    Returns
+    -------
+    list[int]
+        The code of every key, in the order of `keys`.
+    """
+    size = len(keys)
+    if size == 0:
+        return []
+    if isinstance(keys[0], tuple):
+        components = [[key[index] for key in keys] for index in range(len(keys[0]))]
+    else:
+        components = [keys]
+
+    ranks = []
+    counts = []
+    for component in components:
+        rank, count = rank_component(component)
+        ranks.append(rank)
+        counts.append(count)
+
+    # Use int64 arithmetic when the largest code fits, Python ints otherwise
+    largest = size
+    for count in counts:
+        largest *= count
+    if largest < 2 ** 63:
+        codes = np.zeros(size, dtype=np.int64)
+        for rank, count in zip(ranks, counts):
+            codes = codes * count + rank
+        return (codes * size + np.arange(size)).tolist()
+    codes = [0] * size
+    for rank, count in zip(ranks, counts):
+        codes = [code * count + value for code, value in zip(codes, rank.tolist())]
+    return [code * size + position for position, code in enumerate(codes)]
+
+
+def argsort(records: list, key=None, algorithm: str = "QuickSort") -> list[int]:
+    """
+    Find the permutation that stably sorts `records` without moving them.
+
+    Parameters
+    ----------
+    records : list
+        The records to order. They are not modified.
+    key : callable | None
+        Computes the sort key of a record; it is called once per record. The records themselves are the keys if None.
+    algorithm : str
+        The engine that sorts the packed keys: a key of `adaptive_sort.ENGINES`.
+
+    Returns
+    -------
+    list[int]
+        The positions of the records in sorted order; records with equal keys keep their original order.
+    """
+    size = len(records)
+    keys = [key(record) for record in records] if key is not None else list(records)
+    codes = rank_keys(keys)
+    ENGINES[algorithm](codes)
+    return [code % size for code in codes]
+
+
+def sort_records(records: list, key=None, algorithm: str = "QuickSort") -> list:
+    """
+    Return the records stably sorted by `key`.
+
+    Parameters
+    ----------
+    records : list
+        The records to sort. They are not modified.
+    key : callable | None
+        Computes the sort key of a record; it is called once per record. The records themselves are the keys if None.
+    algorithm : str
+        The engine that sorts the packed keys: a key of `adaptive_sort.ENGINES`.
+
+    Returns
+    -------
+    list
+        A new list with the records in sorted order.
+    """
+    return [records[position] for position in argsort(records, key, algorithm)]
+
+
+if __name__ == "__main__":
+    # Test key-function sorting and argsort
+    test_records = [("B", 101.5, 3), ("A", 100.0, 2), ("C", 101.5, 1), ("D", 100.0, 2), ("E", 99.5, 7)]
+    for test_algorithm in ENGINES:
+        assert (sort_records(test_records, key=lambda record: (record[1], record[2]), algorithm=test_algorithm)
+                == sorted(test_records, key=lambda record: (record[1], record[2])))
+        assert argsort([3, 1, 2, 1], algorithm=test_algorithm) == [1, 3, 2, 0]
+    assert sort_records(["pear", "apple", "fig"], key=len) == ["fig", "pear", "apple"]
+    assert argsort([]) == []
+    assert argsort([2 ** 60 + 1, 2 ** 60, 1.5]) == [2, 1, 0] and argsort([2 ** 64 - 1, -1, 2 ** 64 - 2]) == [1, 2, 0]
+    assert argsort([(1.5, 2 ** 60 + 1), (1.5, 2 ** 60), (0.5, 3)]) == [2, 1, 0]
+    print("All tests passed!")
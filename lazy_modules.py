@@ -0,0 +1,53 @@
+"""
+Deferred imports of heavy modules.
+
+NumPy and pandas take hundreds of milliseconds to import, more than a short sort of a few thousand values.
+`lazy_import` returns a module object straight away and runs the real import on the first attribute access,
+so modules that only need NumPy in some of their functions (e.g. the dataset generators) can be imported by
+a job that never calls those functions without paying for NumPy.
+"""
+import importlib.util
+import sys
+
+
+def lazy_import(name: str):
+    """
+    Import a module on first use.
+
+    Parameters
+    ----------
+    name : str
+        The module name, e.g. "numpy".
+
+    Returns
+    -------
+    module
+        The module if it is already imported, otherwise a module that imports itself on first attribute access.
+
+    Raises
+    ------
+    ImportError
+        If the module is not installed.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+if __name__ == "__main__":
+    # Test that the import is deferred until first use
+    test_module = lazy_import("fractions") if "fractions" not in sys.modules else None
+    if test_module is not None:
+        assert type(test_module).__name__ == "_LazyModule"
+        assert test_module.Fraction(1, 2) + test_module.Fraction(1, 2) == 1
+        assert lazy_import("fractions") is test_module
+    assert lazy_import("sys") is sys
+    print("All tests passed!")
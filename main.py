@@ -1,21 +1,32 @@
-import pandas as pd
-import time
-import tracemalloc
+import os
+import re
+import warnings
 
-from datasets import (generate_structured_datasets,
+from benchmark import (BATCH_METHODS,
+                       probe_algorithm,
+                       profile_algorithm,
+                       run_matrix,
+                       sample_memory,
+                       time_algorithm,
+                       time_batch,
+                       trace_memory)
+from parallel import run_cells
+from result_cache import ResultCache
+from tables import RecordTable
+from complexity import extrapolate, fit_complexity, log_spaced_sizes
+from datasets import (STRUCTURED_DATASETS,
+                      generate_datasets,
+                      generate_structured_datasets,
                       generate_large_random_dataset,
                       generate_merge_sort_datasets,
                       generate_quicksort_datasets,
+                      generate_ragged_lists,
                       generate_shell_sort_datasets)
-from quicksort import quicksort
-from merge_sort import merge_sort
-from shell_sort import shell_sort
 
 
-# Time sorting algorithms on the datasets
-def time_sorting_algorithms(size: int) -> pd.DataFrame:
+def general_datasets(size: int) -> dict[str, list]:
     """
-    Run each algorithm on general datasets.
+    Create the general datasets of `size` plus the large random dataset used by the general results.
 
     Parameters
     ----------
@@ -23,197 +34,479 @@ def time_sorting_algorithms(size: int) -> pd.DataFrame:
 
     Returns
     -------
-    pd.DataFrame
+    dict[str, list]
     """
     datasets = generate_structured_datasets(size)
     datasets.update(generate_large_random_dataset(1000000))
-    results = []
+    return datasets
 
+def timing_table(datasets: dict[str, list], measurements: dict[tuple[str, str], dict],
+                 columns: dict[str, str], timeout: float | None = None, repeats: int = 1) -> RecordTable:
+    """
+    Lay out timing cells as one row per dataset with time and swap columns per algorithm.
+
+    Parameters
+    ----------
+    datasets : dict[str, list]
+    measurements : dict[tuple[str, str], dict]
+        The cells returned by `run_matrix`.
+    columns : dict[str, str]
+        The column name prefix of each algorithm. Algorithms that report no swaps (the uncounted
+        variants) get no swaps column.
+    timeout : float | None
+        The per-cell budget the measurements ran with. When set, a "Timed Out" column lists the
+        algorithms that were cancelled on each dataset; their time and swaps are left empty.
+    repeats : int
+        The number of timed sorts per cell. With more than one, every dataset gets one row per repeat,
+        numbered in a "Repeat" column.
+
+    Returns
+    -------
+    RecordTable
+    """
+    counted = [algorithm for algorithm in columns
+               if any(measurements[name, algorithm].get("Swaps") is not None for name in datasets)]
+    results = []
     for name, data in datasets.items():
-        n = len(data)
-
-        # Shell Sort (with gap-aware implementation)
-        arr_shell = data.copy()
-        t1 = time.time()
-        swap_counts = shell_sort(arr_shell)
-        t_shell = time.time() - t1
-        total_shell_swaps = sum(swap_counts)
-
-        # QuickSort
-        arr_quicksort = data.copy()
-        t2 = time.time()
-        quicksort_swaps = quicksort(arr_quicksort, 0, len(arr_quicksort) - 1)
-        t_quick = time.time() - t2
-
-        # MergeSort
-        arr_mergesort = data.copy()
-        t3 = time.time()
-        merge_swaps = merge_sort(arr_mergesort, 0, len(arr_mergesort) - 1)
-        t_merge = time.time() - t3
+        for repeat in range(repeats):
+            row = {"Dataset": name, "Size": len(data)}
+            if repeats > 1:
+                row["Repeat"] = repeat
+            timed_out = []
+            for algorithm, prefix in columns.items():
+                measurement = measurements[name, algorithm]
+                row[f"{prefix} Time (s)"] = measurement["Times"][repeat] if "Times" in measurement else float("nan")
+                if algorithm in counted:
+                    row[f"{prefix} Swaps"] = measurement.get("Swaps")
+                if measurement["Timed Out"]:
+                    timed_out.append(algorithm)
+            if timeout is not None:
+                row["Timed Out"] = ", ".join(timed_out)
+            results.append(row)
+    # Keep the swap counts integral even when a cancelled cell leaves a gap
+    return RecordTable(results, [f"{columns[algorithm]} Swaps" for algorithm in counted])
 
-        results.append({
-            "Dataset": name,
-            "Size": n,
-            "Shell Sort Time (s)": t_shell,
-            "Shell Sort Swaps": total_shell_swaps,
-            "QuickSort Time (s)": t_quick,
-            "QuickSort Swaps": quicksort_swaps,
-            "MergeSort Time (s)": t_merge,
-            "MergeSort Swaps": merge_swaps
-        })
+# Time sorting algorithms on the datasets
+def time_sorting_algorithms(size: int, max_workers: int | None = None, pin_cpus: bool = False,
+                            timeout: float | None = None, datasets: dict[str, list] | None = None,
+                            repeats: int = 1, cache: ResultCache | None = None) -> RecordTable:
+    """
+    Run each algorithm on general datasets.
 
-    return pd.DataFrame(results)
+    Parameters
+    ----------
+    size : int
+    max_workers : int | None
+        The maximum number of benchmark cells running at the same time.
+    pin_cpus : bool
+        Pin each worker process to its own CPU.
+    timeout : float | None
+        The wall-clock budget of each cell in seconds.
+    datasets : dict[str, list] | None
+        The datasets to run on, e.g. to share them with `measure_memory_allocation`.
+        Defaults to the general datasets of `size` plus a large random dataset.
+    repeats : int
+        The number of timed sorts per cell.
+    cache : ResultCache | None
+        The cache of cell results, or None to run every cell.
 
-def time_shell_sort_algorithm(size: int) -> pd.DataFrame:
+    Returns
+    -------
+    RecordTable
+    """
+    if datasets is None:
+        datasets = general_datasets(size)
+    algorithms = ["Shell Sort", "Shell Sort (uncounted)", "QuickSort", "QuickSort (uncounted)",
+                  "MergeSort", "MergeSort (uncounted)", "In-Place MergeSort", "Counting Sort", "Radix Sort"]
+    measurements = run_matrix(time_algorithm, algorithms, datasets, max_workers, pin_cpus, timeout,
+                              arguments=(repeats,), cache=cache)
+    return timing_table(datasets, measurements, {algorithm: algorithm for algorithm in algorithms}, timeout,
+                        repeats)
+
+def time_shell_sort_algorithm(size: int, max_workers: int | None = None, pin_cpus: bool = False,
+                              timeout: float | None = None, repeats: int = 1,
+                              cache: ResultCache | None = None) -> RecordTable:
     """
     Time shell sort algorithm specific datasets.
 
     Parameters
     ----------
     size : int
+    max_workers : int | None
+        The maximum number of benchmark cells running at the same time.
+    pin_cpus : bool
+        Pin each worker process to its own CPU.
+    timeout : float | None
+        The wall-clock budget of each cell in seconds.
+    repeats : int
+        The number of timed sorts per cell.
+    cache : ResultCache | None
+        The cache of cell results, or None to run every cell.
 
     Returns
     -------
-    pd.DataFrame
+    RecordTable
     """
     datasets = generate_shell_sort_datasets(size)
-    results = []
-    for name, data in datasets.items():
-        n = len(data)
-        # Shell Sort (with gap-aware implementation)
-        t1 = time.time()
-        swap_counts = shell_sort(data)
-        t_shell = time.time() - t1
-        total_shell_swaps = sum(swap_counts)
-        results.append({
-            "Dataset": name,
-            "Size": n,
-            "Shell Sort Time (s)": t_shell,
-            "Shell Sort Swaps": total_shell_swaps,
-        })
-    return pd.DataFrame(results)
+    columns = {"Shell Sort": "Shell Sort", "Shell Sort (uncounted)": "Shell Sort (uncounted)"}
+    measurements = run_matrix(time_algorithm, list(columns), datasets, max_workers, pin_cpus, timeout,
+                              arguments=(repeats,), cache=cache)
+    return timing_table(datasets, measurements, columns, timeout, repeats)
 
-def time_merge_sort_algorithm(size: int) -> pd.DataFrame:
+def time_merge_sort_algorithm(size: int, max_workers: int | None = None, pin_cpus: bool = False,
+                              timeout: float | None = None, repeats: int = 1,
+                              cache: ResultCache | None = None) -> RecordTable:
     """
     Time merge sort specific datasets.
 
     Parameters
     ----------
     size : int
+    max_workers : int | None
+        The maximum number of benchmark cells running at the same time.
+    pin_cpus : bool
+        Pin each worker process to its own CPU.
+    timeout : float | None
+        The wall-clock budget of each cell in seconds.
+    repeats : int
+        The number of timed sorts per cell.
+    cache : ResultCache | None
+        The cache of cell results, or None to run every cell.
 
     Returns
     -------
-    pd.DataFrame
+    RecordTable
     """
     datasets = generate_merge_sort_datasets(size)
-    results = []
-    for name, data in datasets.items():
-        n = len(data)
-        t1 = time.time()
-        total_merge_swaps = merge_sort(data, 0, len(data) - 1)
-        t_merge = time.time() - t1
-        results.append({
-            "Dataset": name,
-            "Size": n,
-            "Merge Sort Time (s)": f"{t_merge:.6f}",
-            "Merge Sort Swaps": total_merge_swaps,
-        })
-    return pd.DataFrame(results)
+    columns = {"MergeSort": "Merge Sort", "MergeSort (uncounted)": "Merge Sort (uncounted)",
+               "In-Place MergeSort": "In-Place Merge Sort"}
+    measurements = run_matrix(time_algorithm, list(columns), datasets, max_workers, pin_cpus, timeout,
+                              arguments=(repeats,), cache=cache)
+    return timing_table(datasets, measurements, columns, timeout, repeats)
 
-def time_quick_sort_algorithm(size: int) -> pd.DataFrame:
+def time_quick_sort_algorithm(size: int, max_workers: int | None = None, pin_cpus: bool = False,
+                              timeout: float | None = None, repeats: int = 1,
+                              cache: ResultCache | None = None) -> RecordTable:
     """
     Time quicksort algorithm specific datasets.
 
     Parameters
     ----------
     size : int
+    max_workers : int | None
+        The maximum number of benchmark cells running at the same time.
+    pin_cpus : bool
+        Pin each worker process to its own CPU.
+    timeout : float | None
+        The wall-clock budget of each cell in seconds.
+    repeats : int
+        The number of timed sorts per cell.
+    cache : ResultCache | None
+        The cache of cell results, or None to run every cell.
 
     Returns
     -------
-    pd.DataFrame
+    RecordTable
     """
     datasets = generate_quicksort_datasets(size)
+    columns = {"QuickSort": "QuickSort", "QuickSort (uncounted)": "QuickSort (uncounted)",
+               "QuickSort (median of three)": "QuickSort (median of three)",
+               "QuickSort (ninther)": "QuickSort (ninther)"}
+    measurements = run_matrix(time_algorithm, list(columns), datasets, max_workers, pin_cpus, timeout,
+                              arguments=(repeats,), cache=cache)
+    return timing_table(datasets, measurements, columns, timeout, repeats)
+
+def measure_memory_allocation(size: int, max_workers: int | None = None, pin_cpus: bool = False,
+                              timeout: float | None = None, datasets: dict[str, list] | None = None,
+                              interval: float = 0.005,
+                              cache: ResultCache | None = None) -> tuple[RecordTable, RecordTable]:
+    """
+    Profile the memory of each algorithm on general datasets.
+
+    Every sort runs twice, each time in a fresh worker process: once with RSS/USS sampling, which sees
+    every resident allocation, and once under tracemalloc for the Python heap peak. Neither run is used
+    for timing, so the tracing overhead never reaches the timing results.
+
+    Parameters
+    ----------
+    size : int
+    max_workers : int | None
+        The maximum number of benchmark cells running at the same time.
+    pin_cpus : bool
+        Pin each worker process to its own CPU.
+    timeout : float | None
+        The wall-clock budget of each cell in seconds. When set, a "Memory Timed Out" column lists the
+        algorithms whose RSS or heap profile was cancelled on each dataset; their peaks are left empty.
+    datasets : dict[str, list] | None
+        The datasets to run on, e.g. the ones used by `time_sorting_algorithms`.
+        Defaults to the general datasets of `size` plus a large random dataset.
+    interval : float
+        The time between two memory samples in seconds.
+    cache : ResultCache | None
+        The cache of cell results, or None to run every cell.
+
+    Returns
+    -------
+    tuple[RecordTable, RecordTable]
+        The peak memory per dataset and algorithm, and the sampled memory-over-time timeline of every sort.
+    """
+    if datasets is None:
+        datasets = general_datasets(size)
+    algorithms = ["Shell Sort", "QuickSort", "MergeSort", "In-Place MergeSort", "Counting Sort", "Radix Sort"]
+    resident = run_matrix(sample_memory, algorithms, datasets, max_workers, pin_cpus, timeout, cache=cache)
+    traced = run_matrix(trace_memory, algorithms, datasets, max_workers, pin_cpus, timeout, cache=cache)
     results = []
+    timeline = []
     for name, data in datasets.items():
-        n = len(data)
-        t1 = time.time()
-        total_quicksort_swaps = quicksort(data, 0, len(data) - 1)
-        t_quick = time.time() - t1
-        results.append({
+        row = {"Dataset": name, "Size": len(data)}
+        timed_out = []
+        for algorithm in algorithms:
+            if resident[name, algorithm]["Timed Out"] or traced[name, algorithm]["Timed Out"]:
+                timed_out.append(algorithm)
+            rss = resident[name, algorithm].get("Peak RSS (bytes)")
+            uss = resident[name, algorithm].get("Peak USS (bytes)")
+            heap = traced[name, algorithm].get("Peak Memory (bytes)")
+            row[f"{algorithm} Peak RSS (MB)"] = rss / 1024 ** 2 if rss is not None else float("nan")
+            row[f"{algorithm} Peak USS (MB)"] = uss / 1024 ** 2 if uss is not None else float("nan")
+            row[f"{algorithm} Python Heap Peak (MB)"] = heap / 1024 ** 2 if heap is not None else float("nan")
+            for seconds, rss_sample, uss_sample in resident[name, algorithm].get("Timeline", []):
+                timeline.append({
+                    "Dataset": name,
+                    "Algorithm": algorithm,
+                    "Time (s)": seconds,
+                    "RSS (MB)": rss_sample / 1024 ** 2,
+                    "USS (MB)": uss_sample / 1024 ** 2 if uss_sample is not None else float("nan"),
+                })
+        if timeout is not None:
+            row["Memory Timed Out"] = ", ".join(timed_out)
+        results.append(row)
+    return RecordTable(results), RecordTable(timeline)
+
+def time_selection(algorithms: list[str], dataset_names: list[str], sizes: list[int],
+                   max_workers: int | None = None, pin_cpus: bool = False, timeout: float | None = None,
+                   repeats: int = 1, memory: bool = False, probe: bool = False,
+                   profile_dir: str | None = None, cache: ResultCache | None = None) -> RecordTable:
+    """
+    Time a chosen set of algorithms on a chosen set of datasets and sizes.
+
+    Probing and profiling run in their own cells, separate from the timed sorts, so neither adds
+    overhead to the reported times.
+
+    Parameters
+    ----------
+    algorithms : list[str]
+        Keys of `benchmark.SORTING_ALGORITHMS`.
+    dataset_names : list[str]
+        Keys of `datasets.ALL_DATASETS`.
+    sizes : list[int]
+    max_workers : int | None
+        The maximum number of benchmark cells running at the same time.
+    pin_cpus : bool
+        Pin each worker process to its own CPU.
+    timeout : float | None
+        The wall-clock budget of each cell in seconds.
+    repeats : int
+        The number of timed sorts per cell.
+    memory : bool
+        Also profile the peak RSS, USS and Python heap of every cell. A "Memory Timed Out" column flags the
+        cells whose memory profile was cancelled.
+    probe : bool
+        Also sort every cell once with the probed variant of its algorithm and report the comparisons,
+        moves, recursion depth, partition balance (the mean and the histogram) and phase times.
+    profile_dir : str | None
+        Also sort every cell once under cProfile and write the pstats of each cell to this directory,
+        named `<algorithm>-<dataset>-<size>.pstats`.
+    cache : ResultCache | None
+        The cache of cell results, or None to run every cell.
+
+    Returns
+    -------
+    RecordTable
+        One row per dataset, algorithm, size and (with several repeats) repeat.
+    """
+    if profile_dir:
+        os.makedirs(profile_dir, exist_ok=True)
+    results = []
+    for size in sizes:
+        datasets = generate_datasets(dataset_names, size)
+        measurements = run_matrix(time_algorithm, algorithms, datasets, max_workers, pin_cpus, timeout,
+                                  arguments=(repeats,), cache=cache)
+        if memory:
+            resident = run_matrix(sample_memory, algorithms, datasets, max_workers, pin_cpus, timeout, cache=cache)
+            traced = run_matrix(trace_memory, algorithms, datasets, max_workers, pin_cpus, timeout, cache=cache)
+        if probe:
+            probes = run_matrix(probe_algorithm, algorithms, datasets, max_workers, pin_cpus, timeout, cache=cache)
+        if profile_dir:
+            cells = []
+            for name in datasets:
+                for algorithm in algorithms:
+                    file_name = re.sub(r"[^A-Za-z0-9]+", "_", f"{algorithm}-{name}-{size}").strip("_")
+                    cells.append((algorithm, datasets[name], os.path.join(profile_dir, f"{file_name}.pstats")))
+            run_cells(profile_algorithm, cells, max_workers=max_workers, pin_cpus=pin_cpus, timeout=timeout)
+        for (name, algorithm), measurement in measurements.items():
+            for repeat in range(repeats):
+                row = {"Dataset": name, "Algorithm": algorithm, "Size": len(datasets[name])}
+                if repeats > 1:
+                    row["Repeat"] = repeat
+                row["Time (s)"] = measurement["Times"][repeat] if "Times" in measurement else float("nan")
+                row["Swaps"] = measurement.get("Swaps")
+                row["Timed Out"] = measurement["Timed Out"]
+                if memory:
+                    for metric, cells, key in [("Peak RSS (MB)", resident, "Peak RSS (bytes)"),
+                                               ("Peak USS (MB)", resident, "Peak USS (bytes)"),
+                                               ("Python Heap Peak (MB)", traced, "Peak Memory (bytes)")]:
+                        value = cells[name, algorithm].get(key)
+                        row[metric] = value / 1024 ** 2 if value is not None else float("nan")
+                    row["Memory Timed Out"] = (resident[name, algorithm]["Timed Out"]
+                                               or traced[name, algorithm]["Timed Out"])
+                if probe:
+                    row.update({key: value for key, value in probes[name, algorithm].items() if key != "Timed Out"})
+                results.append(row)
+    return RecordTable(results, ["Swaps"])
+
+def sweep_sizes(min_size: int, max_size: int, steps: int, target_size: int, max_workers: int | None = None,
+                pin_cpus: bool = False, timeout: float | None = None, back_off: bool = False,
+                algorithms: list[str] | None = None,
+                dataset_names: list[str] | None = None,
+                cache: ResultCache | None = None) -> tuple[RecordTable, RecordTable]:
+    """
+    Run every algorithm on every structured dataset shape over log-spaced sizes and fit the growth.
+
+    The sizes run in increasing order, and every row records the length of its dataset. Datasets that are
+    capped below a size (e.g. the quicksort killers, see `datasets.ADVERSARIAL_MAX_SIZE`) are measured once
+    at their cap and skipped, with a warning, at the larger sizes. With `back_off`, an algorithm that exceeds
+    the time budget on a dataset shape is not run on that shape at any larger size, so one slow algorithm
+    cannot hold up the rest of the sweep.
+
+    Parameters
+    ----------
+    min_size : int
+        The smallest dataset size in the sweep.
+    max_size : int
+        The largest dataset size in the sweep.
+    steps : int
+        The number of log-spaced sizes between `min_size` and `max_size`.
+    target_size : int
+        The size to extrapolate the runtime to.
+    max_workers : int | None
+        The maximum number of benchmark cells running at the same time.
+    pin_cpus : bool
+        Pin each worker process to its own CPU.
+    timeout : float | None
+        The wall-clock budget of each cell in seconds.
+    back_off : bool
+        Stop increasing the size of a dataset x algorithm pair once it has timed out.
+    algorithms : list[str] | None
+        The algorithms to sweep. Defaults to shell sort, quicksort and merge sort.
+    dataset_names : list[str] | None
+        The dataset shapes to sweep. Defaults to the structured datasets.
+    cache : ResultCache | None
+        The cache of cell results, or None to run every cell.
+
+    Returns
+    -------
+    tuple[RecordTable, RecordTable]
+        The raw measurements per dataset, algorithm and size, and the fitted complexity of each
+        dataset and algorithm together with the extrapolated time at `target_size`.
+    """
+    if algorithms is None:
+        algorithms = ["Shell Sort", "QuickSort", "MergeSort"]
+    if dataset_names is None:
+        dataset_names = list(STRUCTURED_DATASETS)
+    results = []
+    exhausted = set()
+    measured_lengths = {name: set() for name in dataset_names}
+    capped = {}
+    for size in log_spaced_sizes(min_size, max_size, steps):
+        datasets = generate_datasets(dataset_names, size)
+        # Capped datasets (e.g. the quicksort killers) repeat their largest input at every larger size, which
+        # would show the fit the same input under several sizes
+        for name in list(datasets):
+            if len(datasets[name]) in measured_lengths[name]:
+                capped[name] = len(datasets.pop(name))
+            else:
+                measured_lengths[name].add(len(datasets[name]))
+        if not datasets:
+            continue
+        measurements = run_matrix(time_algorithm, algorithms, datasets, max_workers, pin_cpus, timeout,
+                                  exclude=exhausted, cache=cache)
+        for (name, algorithm), measurement in measurements.items():
+            measurement.pop("Times", None)
+            results.append({"Dataset": name, "Algorithm": algorithm, "Size": len(datasets[name]), **measurement})
+            if back_off and measurement["Timed Out"]:
+                exhausted.add((name, algorithm))
+    for name, length in capped.items():
+        warnings.warn(f"{name} is capped at {length:,} values; the sweep skipped its larger sizes.", stacklevel=2)
+    series = {}
+    for row in results:
+        series.setdefault((row["Dataset"], row["Algorithm"]), []).append(row)
+
+    fits = []
+    for (name, algorithm), rows in series.items():
+        sizes = [row["Size"] for row in rows]
+        time_fit = fit_complexity(sizes, [row.get("Time (s)") for row in rows])
+        swaps_fit = fit_complexity(sizes, [row.get("Swaps") for row in rows])
+        fits.append({
             "Dataset": name,
-            "Size": n,
-            "QuickSort Time (s)": t_quick,
-            "QuickSort Swaps": total_quicksort_swaps,
+            "Algorithm": algorithm,
+            "Time Model": time_fit["Model"],
+            "Time Exponent": time_fit["Exponent"],
+            f"Predicted Time @ {target_size:,} (s)": extrapolate(time_fit, target_size),
+            "Swaps Model": swaps_fit["Model"],
+            "Swaps Exponent": swaps_fit["Exponent"],
         })
-    return pd.DataFrame(results)
+    return RecordTable(results), RecordTable(fits)
 
-def measure_memory_allocation(size: int) -> pd.DataFrame:
-    results = []
-    datasets = generate_structured_datasets(size)
-    datasets.update(generate_large_random_dataset(1000000))
-    for name, data in datasets.items():
-        n = len(data)
-
-        # Shell Sort (with gap-aware implementation)
-        arr_shell = data.copy()
-        tracemalloc.start()
-        shell_sort(arr_shell)
-        shell_current, shell_peak = tracemalloc.get_traced_memory()
-        tracemalloc.stop()
-
-        # QuickSort
-        arr_quicksort = data.copy()
-        tracemalloc.start()
-        quicksort(arr_quicksort, 0, len(arr_quicksort) - 1)
-        quicksort_current, quicksort_peak = tracemalloc.get_traced_memory()
-        tracemalloc.stop()
-
-        # MergeSort
-        arr_mergesort = data.copy()
-        tracemalloc.start()
-        merge_sort(arr_mergesort, 0, len(arr_mergesort) - 1)
-        merge_current, merge_peak = tracemalloc.get_traced_memory()
-        tracemalloc.stop()
+def time_batch_throughput(list_count: int, min_length: int = 10, max_length: int = 500,
+                          max_workers: int | None = None, pin_cpus: bool = False, timeout: float | None = None,
+                          repeats: int = 1, cache: ResultCache | None = None) -> RecordTable:
+    """
+    Measure how many short lists per second each batch method sorts.
 
+    Parameters
+    ----------
+    list_count : int
+        The number of lists in the batch.
+    min_length : int
+        The shortest list length.
+    max_length : int
+        The longest list length.
+    max_workers : int | None
+        The maximum number of benchmark cells running at the same time.
+    pin_cpus : bool
+        Pin each worker process to its own CPU.
+    timeout : float | None
+        The wall-clock budget of each cell in seconds.
+    repeats : int
+        The number of timed sorts of the batch per method.
+    cache : ResultCache | None
+        The cache of cell results, or None to run every cell.
+
+    Returns
+    -------
+    RecordTable
+        One row per method with the time to sort the whole batch and the throughput in lists per second.
+    """
+    name = f"Ragged Lists ({min_length}-{max_length})"
+    datasets = {name: generate_ragged_lists(list_count, min_length, max_length)}
+    measurements = run_matrix(time_batch, list(BATCH_METHODS), datasets, max_workers, pin_cpus, timeout,
+                              arguments=(repeats,), cache=cache)
+    results = []
+    for (name, method), measurement in measurements.items():
         results.append({
             "Dataset": name,
-            "Size": n,
-            "Shell Sort Memory": f"{shell_peak / 1024 ** 2:.4f} MB",
-            "QuickSort Memory": f"{quicksort_peak / 1024 ** 2:.4f} MB",
-            "MergeSort Memory": f"{merge_peak / 1024 ** 2:.4f} MB",
+            "Algorithm": method,
+            "Lists": list_count,
+            "Time (s)": measurement.get("Time (s)", float("nan")),
+            "Lists/s": measurement.get("Lists/s", float("nan")),
+            "Timed Out": measurement["Timed Out"],
         })
-    return pd.DataFrame(results)
+    return RecordTable(results)
+
 
 if __name__ == "__main__":
-    dataset_size = 10000
-    general_results = time_sorting_algorithms(dataset_size)
-    shell_sort_results = time_shell_sort_algorithm(dataset_size)
-    quicksort_results = time_quick_sort_algorithm(dataset_size)
-    merge_sort_results = time_merge_sort_algorithm(dataset_size)
-    memory_allocation_results = measure_memory_allocation(dataset_size)
-    print(f"""
--------------------------
-GENERAL RESULTS
--------------------------
-{general_results}
-
--------------------------
-SHELL SORT RESULTS
--------------------------
-{shell_sort_results}
-
--------------------------
-QUICKSORT RESULTS
--------------------------
-{quicksort_results}
-
--------------------------
-MERGE SORT RESULTS
--------------------------
-{merge_sort_results}
-
--------------------------
-MEMORY ALLOCATION RESULTS
--------------------------
-{memory_allocation_results}
-""")
\ No newline at end of file
+    import sys
+
+    from cli import main
+
+    main(["suite", *sys.argv[1:]])
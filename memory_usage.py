@@ -0,0 +1,157 @@
+"""
+Resident memory sampling for the memory profiling cells.
+
+tracemalloc only sees allocations made through the Python heap, so NumPy buffers and other native
+allocations are missed. This module reads the resident set size (RSS) and unique set size (USS) of the
+current process from the operating system instead, and samples them in a background thread to build a
+memory-over-time timeline of a sort.
+
+psutil is used when it is installed; otherwise the figures are read from /proc on Linux. Without either,
+only the peak RSS reported by `resource.getrusage` is available and USS is reported as None.
+
+Sampling can miss an allocation spike that is shorter than the sampling interval, so the peak RSS of a
+sampler is the larger of the sampled peak and the kernel's RSS high-water mark (`ru_maxrss`), which cannot
+miss one. The high-water mark covers the whole life of the process, so it belongs to a single sort only in a
+fresh worker process.
+"""
+import sys
+import threading
+import time
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+def read_peak_rss() -> int | None:
+    """
+    Read the highest RSS this process has reached so far.
+
+    Returns
+    -------
+    int | None
+        The RSS high-water mark in bytes, or None where `resource` is unavailable.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def read_memory() -> tuple[int, int | None]:
+    """
+    Read the current resident memory of this process.
+
+    Returns
+    -------
+    tuple[int, int | None]
+        The RSS and USS in bytes. USS is None if the platform does not expose it.
+    """
+    if psutil is not None:
+        info = psutil.Process().memory_full_info()
+        return info.rss, getattr(info, "uss", None)
+    try:
+        with open("/proc/self/smaps_rollup") as smaps:
+            fields = dict(line.split(":", 1) for line in smaps if line.endswith("kB\n"))
+    except OSError:
+        # The peak rather than the current RSS
+        return read_peak_rss() or 0, None
+    kilobytes = {name: int(value.split()[0]) for name, value in fields.items()}
+    return kilobytes["Rss"] * 1024, (kilobytes["Private_Clean"] + kilobytes["Private_Dirty"]) * 1024
+
+
+class MemorySampler:
+    """
+    Sample the RSS and USS of this process in a background thread.
+
+    Use as a context manager around the code to be profiled. The samples are stored in `timeline` as
+    (seconds since start, RSS bytes, USS bytes) tuples, and the RSS high-water mark of the process at exit in
+    `high_water_rss`.
+
+    Parameters
+    ----------
+    interval : float
+        The time between two samples in seconds.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.timeline = []
+        self.high_water_rss = None
+        self._start = None
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _sample(self) -> None:
+        rss, uss = read_memory()
+        self.timeline.append((time.perf_counter() - self._start, rss, uss))
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self._sample()
+
+    def __enter__(self) -> "MemorySampler":
+        self._start = time.perf_counter()
+        self._sample()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stopped.set()
+        self._thread.join()
+        self._sample()
+        self.high_water_rss = read_peak_rss()
+
+    @property
+    def peak_rss(self) -> int:
+        """The highest sampled RSS or, if higher, the RSS high-water mark of the process in bytes."""
+        return max(max(rss for _, rss, _ in self.timeline), self.high_water_rss or 0)
+
+    @property
+    def peak_uss(self) -> int | None:
+        """The highest sampled USS in bytes, or None if USS is not available."""
+        samples = [uss for _, _, uss in self.timeline if uss is not None]
+        return max(samples) if samples else None
+
+
+if __name__ == "__main__":
+    # Test each source of read_memory, and that the sampler sees both a held and a short-lived buffer
+    buffer_size = 100 * 1024 ** 2
+    test_rss, test_uss = read_memory()
+    assert test_rss > 0 and (test_uss is None or 0 < test_uss <= test_rss)
+    assert read_peak_rss() is None or read_peak_rss() >= test_rss
+    test_psutil, psutil = psutil, None
+    test_rss, test_uss = read_memory()
+    assert test_rss > 0
+    # Without psutil and /proc, only the high-water mark is left
+
+    def open(*arguments):
+        raise OSError("No /proc")
+
+    assert read_memory() == (read_peak_rss() or 0, None)
+    del open
+    psutil = test_psutil
+
+    with MemorySampler(0.001) as test_sampler:
+        test_buffer = b"x" * buffer_size
+        time.sleep(0.1)
+        del test_buffer
+    baseline = test_sampler.timeline[0][1]
+    assert max(rss for _, rss, _ in test_sampler.timeline) >= baseline + 0.9 * buffer_size
+    assert test_sampler.timeline == sorted(test_sampler.timeline, key=lambda sample: sample[0])
+
+    # A spike between two samples is only seen through the high-water mark
+    with MemorySampler(60) as test_sampler:
+        test_buffer = b"x" * (2 * buffer_size)
+        del test_buffer
+    assert len(test_sampler.timeline) == 2
+    if test_sampler.high_water_rss is not None:
+        assert test_sampler.peak_rss >= test_sampler.timeline[0][1] + 1.8 * buffer_size
+    print("All tests passed!")
@@ -8,7 +8,18 @@ Once fully merged, this temporary merged list is copied back to the original lis
 Merge sort is a divide and conquer algorithm that divides the input array into two halves,
 recursively sorts the two halves and merges the sorted halves to create a sorted array.
 The time complexity varies based on the given sequence, but the average runtime is O(NlogN).
+
+`merge_sort_in_place` is a stable variant that needs no merge buffer: it merges by splitting both partitions
+and rotating the middle pieces past each other, in O(NlogN^2) time with O(1) extra memory besides the
+O(logN) recursion stack.
+
+`merge_many` merges any number of already sorted sequences (lists, arrays or generators) lazily through a heap,
+in O(NlogK) time for K sequences, instead of concatenating and sorting them again.
 """
+import bisect
+import heapq
+import itertools
+import time
 
 def merge(numbers: list[int | float], start_index: int, mid_index: int, end_index: int) -> int:
     """
@@ -62,7 +73,254 @@ def merge(numbers: list[int | float], start_index: int, mid_index: int, end_inde
     return swap_count
 
 
-def merge_sort(numbers: list[int | float], start_index: int, end_index: int) -> int:
+def merge_uncounted(numbers: list[int | float], start_index: int, mid_index: int, end_index: int) -> None:
+    """
+    Merge two sorted subarrays into a single sorted subarray like `merge`, without counting swaps.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+        The list containing the subarrays to merge
+    start_index : int
+        Start index of the first subarray
+    mid_index : int
+        End index of the first subarray
+    end_index : int
+        End index of the second subarray (second subarray starts at j+1)
+    """
+    merged_size = end_index - start_index + 1
+    merged_numbers = [0] * merged_size
+    merge_position = 0
+    left_position = start_index
+    right_position = mid_index + 1
+    while left_position <= mid_index and right_position <= end_index:
+        if numbers[left_position] <= numbers[right_position]:
+            merged_numbers[merge_position] = numbers[left_position]
+            left_position += 1
+        else:
+            merged_numbers[merge_position] = numbers[right_position]
+            right_position += 1
+        merge_position += 1
+    while left_position <= mid_index:
+        merged_numbers[merge_position] = numbers[left_position]
+        left_position += 1
+        merge_position += 1
+    while right_position <= end_index:
+        merged_numbers[merge_position] = numbers[right_position]
+        right_position += 1
+        merge_position += 1
+    for merge_index in range(merged_size):
+        numbers[start_index + merge_index] = merged_numbers[merge_index]
+
+
+def merge_sort_uncounted(numbers: list[int | float], start_index: int, end_index: int) -> None:
+    """
+    Sort a subarray using the merge sort algorithm without any swap counting.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+        - The list to be sorted (sorted in-place)
+    start_index : int
+        - Start index of the subarray to be sorted
+    end_index : int
+        - End index of the subarray to be sorted
+    """
+    if start_index < end_index:
+        mid_index = (start_index + end_index) // 2
+        merge_sort_uncounted(numbers, start_index, mid_index)
+        merge_sort_uncounted(numbers, mid_index + 1, end_index)
+        merge_uncounted(numbers, start_index, mid_index, end_index)
+
+
+def merge_probed(numbers: list[int | float], start_index: int, mid_index: int, end_index: int, probe) -> int:
+    """
+    Merge two sorted subarrays like `merge`, recording comparisons and moves in `probe`.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+        The list containing the subarrays to merge
+    start_index : int
+        Start index of the first subarray
+    mid_index : int
+        End index of the first subarray
+    end_index : int
+        End index of the second subarray (second subarray starts at j+1)
+    probe : instrumentation.Probe
+        The probe to record into
+
+    Returns
+    -------
+    int
+        The number of swaps made during the merge process
+    """
+    swap_count = 0
+    comparisons = 0
+    merged_size = end_index - start_index + 1
+    merged_numbers = [0] * merged_size
+    merge_position = 0
+    left_position = start_index
+    right_position = mid_index + 1
+    while left_position <= mid_index and right_position <= end_index:
+        comparisons += 1
+        if numbers[left_position] <= numbers[right_position]:
+            merged_numbers[merge_position] = numbers[left_position]
+            left_position += 1
+        else:
+            merged_numbers[merge_position] = numbers[right_position]
+            swap_count += (mid_index - left_position + 1)
+            right_position += 1
+        merge_position += 1
+    while left_position <= mid_index:
+        merged_numbers[merge_position] = numbers[left_position]
+        left_position += 1
+        merge_position += 1
+    while right_position <= end_index:
+        merged_numbers[merge_position] = numbers[right_position]
+        right_position += 1
+        merge_position += 1
+    for merge_index in range(merged_size):
+        numbers[start_index + merge_index] = merged_numbers[merge_index]
+    probe.comparisons += comparisons
+    # Every element is written once into the merged list and once back
+    probe.moves += 2 * merged_size
+    return swap_count
+
+
+def merge_sort_probed(numbers: list[int | float], start_index: int, end_index: int, probe, depth: int = 1) -> int:
+    """
+    Sort a subarray like `merge_sort`, recording counters, recursion depth and merge time in `probe`.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+        - The list to be sorted (sorted in-place)
+    start_index : int
+        - Start index of the subarray to be sorted
+    end_index : int
+        - End index of the subarray to be sorted
+    probe : instrumentation.Probe
+        - The probe to record into
+    depth : int
+        - The recursion level of this call
+
+    Returns
+    -------
+    int
+        The total number of swaps made during the sorting process
+    """
+    probe.enter(depth)
+    if start_index < end_index:
+        mid_index = (start_index + end_index) // 2
+        left_swaps = merge_sort_probed(numbers, start_index, mid_index, probe, depth + 1)
+        right_swaps = merge_sort_probed(numbers, mid_index + 1, end_index, probe, depth + 1)
+        start = time.perf_counter()
+        merge_swaps = merge_probed(numbers, start_index, mid_index, end_index, probe)
+        probe.add_time("merge", time.perf_counter() - start)
+        return left_swaps + right_swaps + merge_swaps
+    return 0
+
+
+def reverse_range(numbers: list[int | float], start_index: int, end_index: int) -> None:
+    """
+    Reverse numbers[start_index:end_index] in-place by swapping, without a temporary list.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+    start_index : int
+        First index of the range
+    end_index : int
+        One past the last index of the range
+    """
+    end_index -= 1
+    while start_index < end_index:
+        numbers[start_index], numbers[end_index] = numbers[end_index], numbers[start_index]
+        start_index += 1
+        end_index -= 1
+
+
+def merge_in_place(numbers: list[int | float], start_index: int, mid_index: int, end_index: int) -> int:
+    """
+    Merge two adjacent sorted subarrays without a merge buffer, counting swaps like `merge`.
+
+    The longer partition is split in half and the other partition is split where the middle value of the longer
+    one would be inserted, which divides the two partitions into A1 A2 | B1 B2 with every value of A2 larger than
+    every value of B1. Rotating A2 B1 into B1 A2 (three reversals) leaves A1 B1 and A2 B2 to merge recursively.
+    Equal values never pass each other, so the merge is stable, and every value of A2 passing every value of B1
+    adds len(A2) * len(B1) swaps, the same inversions `merge` counts.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+        The list containing the subarrays to merge
+    start_index : int
+        Start index of the first subarray
+    mid_index : int
+        End index of the first subarray
+    end_index : int
+        End index of the second subarray (second subarray starts at mid_index+1)
+
+    Returns
+    -------
+    int
+        The number of swaps made during the merge process
+    """
+    left_size = mid_index - start_index + 1
+    right_size = end_index - mid_index
+    if left_size == 0 or right_size == 0:
+        return 0
+    if left_size + right_size == 2:
+        if numbers[end_index] < numbers[start_index]:
+            numbers[start_index], numbers[end_index] = numbers[end_index], numbers[start_index]
+            return 1
+        return 0
+    if left_size > right_size:
+        left_cut = start_index + left_size // 2
+        right_cut = bisect.bisect_left(numbers, numbers[left_cut], mid_index + 1, end_index + 1)
+    else:
+        right_cut = mid_index + 1 + right_size // 2
+        left_cut = bisect.bisect_right(numbers, numbers[right_cut], start_index, mid_index + 1)
+    # Rotate A2 = [left_cut, mid_index] past B1 = [mid_index + 1, right_cut)
+    reverse_range(numbers, left_cut, mid_index + 1)
+    reverse_range(numbers, mid_index + 1, right_cut)
+    reverse_range(numbers, left_cut, right_cut)
+    swap_count = (mid_index + 1 - left_cut) * (right_cut - mid_index - 1)
+    new_mid_index = left_cut + (right_cut - mid_index - 1)
+    swap_count += merge_in_place(numbers, start_index, left_cut - 1, new_mid_index - 1)
+    swap_count += merge_in_place(numbers, new_mid_index, right_cut - 1, end_index)
+    return swap_count
+
+
+def merge_sort_in_place(numbers: list[int | float], start_index: int, end_index: int) -> int:
+    """
+    Sort a subarray with the stable, buffer-free merge sort and count the number of swaps.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+        - The list to be sorted (sorted in-place)
+    start_index : int
+        - Start index of the subarray to be sorted
+    end_index : int
+        - End index of the subarray to be sorted
+
+    Returns
+    -------
+    int
+        The total number of swaps made during the sorting process, the same count `merge_sort` reports
+    """
+    if start_index < end_index:
+        mid_index = (start_index + end_index) // 2
+        left_swaps = merge_sort_in_place(numbers, start_index, mid_index)
+        right_swaps = merge_sort_in_place(numbers, mid_index + 1, end_index)
+        return left_swaps + right_swaps + merge_in_place(numbers, start_index, mid_index, end_index)
+    return 0
+
+
+def merge_sort(numbers: list[int | float], start_index: int, end_index: int, count: bool = True,
+               probe=None, in_place: bool = False) -> int | None:
     """
     Sort a subarray using the merge sort algorithm and count the number of swaps.
 
@@ -78,13 +336,29 @@ def merge_sort(numbers: list[int | float], start_index: int, end_index: int) ->
         - Start index of the subarray to be sorted
     end_index : int
         - End index of the subarray to be sorted
+    count : bool
+        - Count the swaps. With False, the sort runs `merge_sort_uncounted`, which has no counter bookkeeping.
+    probe : instrumentation.Probe | None
+        - Record comparisons, moves, recursion depth and merge time into this probe. The sort then runs
+          `merge_sort_probed`; without a probe no instrumentation code runs at all.
+    in_place : bool
+        - Merge without a buffer with `merge_sort_in_place`, using O(1) extra memory instead of O(N) at the
+          cost of O(NlogN^2) time. The order of equal values and the swap count are the same.
 
     Returns
     -------
-    int
-        The total number of swaps made during the sorting process
+    int | None
+        The total number of swaps made during the sorting process, or None if `count` is False
     """
-    if numbers:
+    if probe is not None:
+        return merge_sort_probed(numbers, start_index, end_index, probe) if len(numbers) else 0
+    if in_place:
+        swap_count = merge_sort_in_place(numbers, start_index, end_index)
+        return swap_count if count else None
+    if not count:
+        merge_sort_uncounted(numbers, start_index, end_index)
+        return None
+    if len(numbers):
         if start_index < end_index:
             mid_index = (start_index + end_index) // 2
             # recursively sort left and right partitions
@@ -96,6 +370,132 @@ def merge_sort(numbers: list[int | float], start_index: int, end_index: int) ->
     return 0
 
 
+class MergeMany:
+    """
+    Lazily merge sorted iterables into one sorted stream.
+
+    Iterate over it for the merged values one at a time, or call `batches` to consume them in lists. The heap
+    holds one (key, shard number, value) entry per iterable, so values are only compared through their keys,
+    and values with equal keys come out in the order of their iterables, which keeps the merge stable.
+
+    With `count`, the cross-shard inversions are counted while merging: the pairs of values x, y where x comes
+    from an earlier iterable than y and has a larger key. Within each iterable there are none, as they are
+    sorted, so this is the swap count of merge sorting the concatenated iterables. A Fenwick tree over the
+    iterables counts, for every value merged, the values already merged from later iterables, in O(logK).
+
+    Parameters
+    ----------
+    iterables : iterable
+        The sorted lists, arrays or generators to merge.
+    key : callable | None
+        The sort key of a value; each value's key is computed once. The values themselves are compared if None.
+    count : bool
+        Count the cross-shard inversions in `inversions`.
+
+    Attributes
+    ----------
+    inversions : int
+        The cross-shard inversions among the values merged so far (0 without `count`).
+    """
+
+    def __init__(self, iterables, key=None, count: bool = False):
+        self.key = key
+        self.count = count
+        self.inversions = 0
+        self._iterators = [iter(iterable) for iterable in iterables]
+        # Fenwick tree of the number of values merged from each iterable, 1-based
+        self._merged = [0] * (len(self._iterators) + 1)
+        self._stream = self._merge()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._stream)
+
+    def _count_merged(self, shard: int) -> None:
+        """
+        Add the values merged from iterables after `shard` to `inversions`, then record one merged from `shard`.
+
+        Parameters
+        ----------
+        shard : int
+        """
+        shards = len(self._iterators)
+        total = 0
+        index = shards
+        while index > 0:
+            total += self._merged[index]
+            index -= index & -index
+        index = shard + 1
+        while index > 0:
+            total -= self._merged[index]
+            index -= index & -index
+        self.inversions += total
+        index = shard + 1
+        while index <= shards:
+            self._merged[index] += 1
+            index += index & -index
+
+    def _merge(self):
+        key = self.key
+        heap = []
+        for shard, iterator in enumerate(self._iterators):
+            for value in iterator:
+                heap.append((value if key is None else key(value), shard, value))
+                break
+        heapq.heapify(heap)
+        while heap:
+            _, shard, value = heap[0]
+            if self.count:
+                self._count_merged(shard)
+            yield value
+            for following in self._iterators[shard]:
+                heapq.heapreplace(heap, (following if key is None else key(following), shard, following))
+                break
+            else:
+                heapq.heappop(heap)
+
+    def batches(self, size: int = 1024):
+        """
+        Consume the merged values in lists of up to `size` values.
+
+        Parameters
+        ----------
+        size : int
+
+        Yields
+        ------
+        list
+        """
+        while True:
+            batch = list(itertools.islice(self._stream, size))
+            if not batch:
+                return
+            yield batch
+
+
+def merge_many(iterables, key=None, count: bool = False) -> MergeMany:
+    """
+    Merge any number of sorted iterables into one sorted stream, lazily.
+
+    Parameters
+    ----------
+    iterables : iterable
+        The sorted lists, arrays or generators to merge, e.g. one per shard.
+    key : callable | None
+        The sort key of a value. The values themselves are compared if None.
+    count : bool
+        Count the cross-shard inversions in the `inversions` attribute of the stream.
+
+    Returns
+    -------
+    MergeMany
+        An iterator over the merged values, which can also be consumed in lists with `batches`.
+    """
+    return MergeMany(iterables, key, count)
+
+
 if __name__ == "__main__":
     test_one = [38, 27, 43, 3, 9, 82, 10]
     merge_sort(test_one, 0, len(test_one) - 1)
@@ -107,4 +507,28 @@ if __name__ == "__main__":
 
     test_three = [3.14, 1.59, 2.65, 3.58, 9.79, 3.23]
     merge_sort(test_three, 0, len(test_three)-1)
-    assert test_three == [1.59, 2.65, 3.14, 3.23, 3.58, 9.79]
\ No newline at end of file
+    assert test_three == [1.59, 2.65, 3.14, 3.23, 3.58, 9.79]
+
+    test_four = [38, 27, 43, 3, 9, 82, 10]
+    assert merge_sort(test_four, 0, len(test_four) - 1, count=False) is None
+    assert test_four == [3, 9, 10, 27, 38, 43, 82]
+
+    test_five = [(3, "a"), (1, "b"), (3, "c"), (2, "d"), (1, "e"), (3, "f")]
+    test_five_copy = list(test_five)
+    assert (merge_sort(test_five, 0, len(test_five) - 1, in_place=True)
+            == merge_sort(test_five_copy, 0, len(test_five_copy) - 1))
+    assert test_five == test_five_copy
+
+    test_six = [8, 4, 2, 8, 3, 4, 7, 1, 0, 9, 5]
+    assert merge_sort(test_six, 0, len(test_six) - 1, in_place=True) == 29
+    assert test_six == [0, 1, 2, 3, 4, 4, 5, 7, 8, 8, 9]
+
+    test_shards = [[1, 4, 9], (value for value in [2, 4, 5]), [], [0, 10]]
+    test_stream = merge_many(test_shards, count=True)
+    assert list(test_stream) == [0, 1, 2, 4, 4, 5, 9, 10]
+    test_concatenated = [1, 4, 9, 2, 4, 5, 0, 10]
+    assert test_stream.inversions == merge_sort(test_concatenated, 0, len(test_concatenated) - 1)
+
+    test_rows = [[(1, "a"), (3, "b")], [(1, "c"), (2, "d")]]
+    test_batches = list(merge_many(test_rows, key=lambda row: row[0]).batches(3))
+    assert test_batches == [[(1, "a"), (1, "c"), (2, "d")], [(3, "b")]]
@@ -0,0 +1,165 @@
+"""
+Process-isolated execution of benchmark cells.
+
+A cell is a single call of a measurement function, e.g. one sorting algorithm applied to one dataset.
+Every cell runs in a freshly started worker process, so a measurement never shares heap state or
+garbage collector pressure with the measurements that ran before it. At most `max_workers` cells run
+at the same time, and each worker can optionally be pinned to a CPU of its own. A cell that exceeds
+its wall-clock budget is cancelled by killing its worker process.
+"""
+import multiprocessing
+import os
+import sys
+import time
+from multiprocessing.connection import wait
+
+# The recursion limit of the workers. Quicksort recurses as deep as its input is long on a killer sequence
+# (see `datasets.ADVERSARIAL_DATASETS`), which the default limit of 1000 cannot accommodate.
+RECURSION_LIMIT = 100_000
+
+
+def available_cpus() -> list[int]:
+    """
+    List the CPUs the current process is allowed to run on.
+
+    Returns
+    -------
+    list[int]
+        The CPU ids available to this process.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _run_cell(connection, function, arguments: tuple, cpu: int | None) -> None:
+    """
+    Worker process entry point: run one cell and send its result back to the parent.
+
+    Parameters
+    ----------
+    connection : multiprocessing.connection.Connection
+        The sending end of the pipe back to the parent process.
+    function : callable
+        The measurement function to call.
+    arguments : tuple
+        The positional arguments for `function`.
+    cpu : int | None
+        The CPU to pin this worker to, or None to leave the affinity unchanged.
+    """
+    if cpu is not None and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {cpu})
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), RECURSION_LIMIT))
+    try:
+        result = function(*arguments)
+    except Exception as error:
+        connection.send((False, f"{type(error).__name__}: {error}"))
+    else:
+        connection.send((True, result))
+    connection.close()
+
+
+def stop_worker(process) -> None:
+    """
+    Terminate a worker process, killing it if it does not exit promptly.
+
+    Parameters
+    ----------
+    process : multiprocessing.Process
+    """
+    process.terminate()
+    process.join(1)
+    if process.is_alive():
+        process.kill()
+        process.join()
+
+
+def run_cells(function, cells: list[tuple], max_workers: int | None = None, pin_cpus: bool = False,
+              timeout: float | None = None, start_method: str = "spawn") -> list:
+    """
+    Run `function` once per cell, each call in its own worker process.
+
+    Parameters
+    ----------
+    function : callable
+        A module-level (picklable) function, called as `function(*cell)`.
+    cells : list[tuple]
+        The positional arguments for each call.
+    max_workers : int | None
+        The maximum number of cells running at the same time. Defaults to the number of available CPUs.
+    pin_cpus : bool
+        Pin each worker to a CPU that no other running worker is using.
+    timeout : float | None
+        The wall-clock budget of each cell in seconds, measured from the start of its worker process.
+        Cells still running after their budget are cancelled.
+    start_method : str
+        The multiprocessing start method. "spawn" gives every cell a fresh interpreter.
+
+    Returns
+    -------
+    list
+        The result of each cell, in the same order as `cells`. Cancelled cells have a result of None.
+    """
+    context = multiprocessing.get_context(start_method)
+    free_cpus = available_cpus()
+    if max_workers is None:
+        max_workers = len(free_cpus)
+    if pin_cpus:
+        max_workers = min(max_workers, len(free_cpus))
+    max_workers = max(1, max_workers)
+
+    results = [None] * len(cells)
+    pending = list(enumerate(cells))[::-1]
+    running = {}
+    try:
+        while pending or running:
+            # Start new workers until the concurrency limit is reached
+            while pending and len(running) < max_workers:
+                index, arguments = pending.pop()
+                cpu = free_cpus.pop(0) if pin_cpus else None
+                receiver, sender = context.Pipe(duplex=False)
+                process = context.Process(target=_run_cell, args=(sender, function, arguments, cpu), daemon=True)
+                process.start()
+                sender.close()
+                deadline = time.monotonic() + timeout if timeout is not None else None
+                running[receiver] = (index, process, cpu, deadline)
+            # Wait until a worker finishes or the earliest budget runs out
+            deadlines = [deadline for *_, deadline in running.values() if deadline is not None]
+            wait_time = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            for receiver in wait(list(running), wait_time):
+                index, process, cpu, _ = running.pop(receiver)
+                try:
+                    succeeded, result = receiver.recv()
+                except EOFError:
+                    succeeded, result = False, f"worker exited with code {process.exitcode}"
+                receiver.close()
+                process.join()
+                if cpu is not None:
+                    free_cpus.append(cpu)
+                if not succeeded:
+                    raise RuntimeError(f"Benchmark cell {index} failed: {result}")
+                results[index] = result
+            # Cancel every cell that has run out of budget
+            now = time.monotonic()
+            for receiver, (index, process, cpu, deadline) in list(running.items()):
+                if deadline is not None and deadline <= now and not receiver.poll():
+                    del running[receiver]
+                    stop_worker(process)
+                    receiver.close()
+                    if cpu is not None:
+                        free_cpus.append(cpu)
+    finally:
+        for receiver, (_, process, *_) in running.items():
+            stop_worker(process)
+            receiver.close()
+    return results
+
+
+if __name__ == "__main__":
+    # Test that cells run in workers and that a cell running past its budget is cancelled and its worker killed
+    assert run_cells(max, [(1, 2), (5, 3)], max_workers=2) == [2, 5]
+    test_start = time.monotonic()
+    assert run_cells(time.sleep, [(60,)], timeout=1) == [None]
+    assert time.monotonic() - test_start < 30
+    assert not multiprocessing.active_children()
+    print("All tests passed!")
@@ -7,7 +7,180 @@ Quicksort is then called recursively to sort the low and high partitions. This r
 until a partition has one or zero elements, which will already be sorted.
 
 The time complexity varies based on the given sequence, but the average runtime is O(NlogN).
+
+The pivot is the middle element of the segment by default. The median-of-three and ninther (Tukey's median of
+three medians of three) pivot rules are available through `pivot_rule`: the chosen pivot is swapped to the
+middle of the segment, and the segment is then partitioned as usual.
 """
+import functools
+import time
+
+
+def median_of_three(numbers: list[int | float], first: int, second: int, third: int) -> int:
+    """
+    Find the index of the median of three values.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+    first : int
+    second : int
+    third : int
+        The indices of the three values.
+
+    Returns
+    -------
+    int
+        The index holding the median value.
+    """
+    if numbers[first] < numbers[second]:
+        if numbers[second] < numbers[third]:
+            return second
+        return third if numbers[first] < numbers[third] else first
+    if numbers[first] < numbers[third]:
+        return first
+    return third if numbers[second] < numbers[third] else second
+
+
+def median_of_three_probed(numbers: list[int | float], first: int, second: int, third: int, probe) -> int:
+    """
+    Find the index of the median of three values like `median_of_three`, recording the comparisons in `probe`.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+    first : int
+    second : int
+    third : int
+        The indices of the three values.
+    probe : instrumentation.Probe
+        The probe to record into
+
+    Returns
+    -------
+    int
+        The index holding the median value.
+    """
+    probe.comparisons += 2
+    if numbers[first] < numbers[second]:
+        if numbers[second] < numbers[third]:
+            return second
+        probe.comparisons += 1
+        return third if numbers[first] < numbers[third] else first
+    if numbers[first] < numbers[third]:
+        return first
+    probe.comparisons += 1
+    return third if numbers[second] < numbers[third] else second
+
+
+def midpoint_pivot(numbers: list[int | float], low_index: int, high_index: int, median=median_of_three) -> int:
+    """
+    Choose the middle element of the segment as the pivot.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+    low_index : int
+    high_index : int
+    median : callable
+        Unused; every pivot rule takes it.
+
+    Returns
+    -------
+    int
+        The index of the pivot.
+    """
+    return low_index + (high_index - low_index) // 2
+
+
+def median_of_three_pivot(numbers: list[int | float], low_index: int, high_index: int,
+                          median=median_of_three) -> int:
+    """
+    Choose the median of the first, middle and last elements of the segment as the pivot.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+    low_index : int
+    high_index : int
+    median : callable
+        Finds the median of three values, e.g. `median_of_three`.
+
+    Returns
+    -------
+    int
+        The index of the pivot.
+    """
+    return median(numbers, low_index, low_index + (high_index - low_index) // 2, high_index)
+
+
+def ninther_pivot(numbers: list[int | float], low_index: int, high_index: int,
+                  median=median_of_three) -> int:
+    """
+    Choose the ninther as the pivot: the median of the medians of three groups of three elements, spread evenly
+    over the segment. Segments of fewer than 9 elements use the median of three.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+    low_index : int
+    high_index : int
+    median : callable
+        Finds the median of three values, e.g. `median_of_three`.
+
+    Returns
+    -------
+    int
+        The index of the pivot.
+    """
+    eighth = (high_index - low_index) // 8
+    if eighth == 0:
+        return median_of_three_pivot(numbers, low_index, high_index, median)
+    midpoint = low_index + (high_index - low_index) // 2
+    return median(numbers,
+                  median(numbers, low_index, low_index + eighth, low_index + 2 * eighth),
+                  median(numbers, midpoint - eighth, midpoint, midpoint + eighth),
+                  median(numbers, high_index - 2 * eighth, high_index - eighth, high_index))
+
+
+# The pivot rules by name
+PIVOT_RULES = {
+    "Midpoint": midpoint_pivot,
+    "Median of Three": median_of_three_pivot,
+    "Ninther": ninther_pivot,
+}
+
+
+def place_pivot(numbers: list[int | float], low_index: int, high_index: int, pivot_rule: str, probe=None) -> int:
+    """
+    Choose the pivot of a segment with a pivot rule and swap it to the middle of the segment, where the
+    partition functions take their pivot from.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+    low_index : int
+    high_index : int
+    pivot_rule : str
+        A key of `PIVOT_RULES`.
+    probe : instrumentation.Probe | None
+        Record the comparisons made to choose the pivot into this probe.
+
+    Returns
+    -------
+    int
+        The number of swaps made: 0 if the pivot was already in the middle, otherwise 1.
+    """
+    midpoint = low_index + (high_index - low_index) // 2
+    if probe is None:
+        pivot_index = PIVOT_RULES[pivot_rule](numbers, low_index, high_index)
+    else:
+        median = functools.partial(median_of_three_probed, probe=probe)
+        pivot_index = PIVOT_RULES[pivot_rule](numbers, low_index, high_index, median)
+    if pivot_index == midpoint:
+        return 0
+    numbers[midpoint], numbers[pivot_index] = numbers[pivot_index], numbers[midpoint]
+    return 1
 
 
 def partition(numbers: list[int | float], low_index: int, high_index: int) -> tuple[int, int]:
@@ -48,9 +221,42 @@ def partition(numbers: list[int | float], low_index: int, high_index: int) -> tu
     return high_index, swap_count
 
 
-def quicksort(numbers: list[int | float], low_index: int, high_index: int) -> int:
+def partition_uncounted(numbers: list[int | float], low_index: int, high_index: int) -> int:
     """
-    Sort a segment of the list using the quicksort algorithm and count the number of swaps.
+    Partition the array segment like `partition`, without counting swaps.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+        The list to be partitioned
+    low_index : int
+        The lower bound of the segment to be partitioned
+    high_index : int
+        The upper bound of the segment to be partitioned
+
+    Returns
+    -------
+    int
+        The index of the last element in the lower partition.
+    """
+    midpoint = low_index + (high_index - low_index) // 2
+    pivot = numbers[midpoint]
+    while True:
+        while numbers[low_index] < pivot:
+            low_index += 1
+        while pivot < numbers[high_index]:
+            high_index -= 1
+        if low_index >= high_index:
+            return high_index
+        numbers[low_index], numbers[high_index] = numbers[high_index], numbers[low_index]
+        low_index += 1
+        high_index -= 1
+
+
+def quicksort_uncounted(numbers: list[int | float], low_index: int, high_index: int,
+                        pivot_rule: str = "Midpoint") -> None:
+    """
+    Sort a segment of the list using the quicksort algorithm without any swap counting.
 
     Parameters
     ----------
@@ -60,26 +266,187 @@ def quicksort(numbers: list[int | float], low_index: int, high_index: int) -> in
         The lower bound of the segment to be sorted
     high_index : int
         The upper bound of the segment to be sorted
+    pivot_rule : str
+        A key of `PIVOT_RULES`
+    """
+    if low_index >= high_index:
+        return
+    if pivot_rule != "Midpoint":
+        place_pivot(numbers, low_index, high_index, pivot_rule)
+    partition_index = partition_uncounted(numbers, low_index, high_index)
+    quicksort_uncounted(numbers, low_index, partition_index, pivot_rule)
+    quicksort_uncounted(numbers, partition_index + 1, high_index, pivot_rule)
+
+
+def partition_probed(numbers: list[int | float], low_index: int, high_index: int, probe) -> tuple[int, int]:
+    """
+    Partition the array segment like `partition`, recording comparisons and moves in `probe`.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+        The list to be partitioned
+    low_index : int
+        The lower bound of the segment to be partitioned
+    high_index : int
+        The upper bound of the segment to be partitioned
+    probe : instrumentation.Probe
+        The probe to record into
+
+    Returns
+    -------
+    tuple[int, int]
+        A tuple containing the index of the last element in the lower partition and the number of swaps made.
+    """
+    midpoint = low_index + (high_index - low_index) // 2
+    pivot = numbers[midpoint]
+    swap_count = 0
+    comparisons = 0
+    done = False
+    while not done:
+        # Every loop test is a comparison, including the one that ends the loop
+        comparisons += 1
+        while numbers[low_index] < pivot:
+            low_index += 1
+            comparisons += 1
+        comparisons += 1
+        while pivot < numbers[high_index]:
+            high_index -= 1
+            comparisons += 1
+        if low_index >= high_index:
+            done = True
+        else:
+            numbers[low_index], numbers[high_index] = numbers[high_index], numbers[low_index]
+            swap_count += 1
+            low_index += 1
+            high_index -= 1
+    probe.comparisons += comparisons
+    probe.moves += 2 * swap_count
+    return high_index, swap_count
+
+
+def quicksort_probed(numbers: list[int | float], low_index: int, high_index: int, probe, depth: int = 1,
+                     pivot_rule: str = "Midpoint") -> int:
+    """
+    Sort a segment of the list like `quicksort`, recording counters, recursion depth, partition balance
+    and partition time in `probe`.
+
+    Parameters
+    ----------
+    numbers : list
+        The list to be sorted (modified in-place)
+    low_index : int
+        The lower bound of the segment to be sorted
+    high_index : int
+        The upper bound of the segment to be sorted
+    probe : instrumentation.Probe
+        The probe to record into
+    depth : int
+        The recursion level of this call
+    pivot_rule : str
+        A key of `PIVOT_RULES`
 
     Returns
     -------
     int
         The total number of swaps made during the sorting process
     """
-    if not numbers:
+    probe.enter(depth)
+    if low_index >= high_index:
+        return 0
+    start = time.perf_counter()
+    swap_count_pivot = (0 if pivot_rule == "Midpoint"
+                        else place_pivot(numbers, low_index, high_index, pivot_rule, probe))
+    probe.moves += 2 * swap_count_pivot
+    partition_index, swap_count_partition = partition_probed(numbers, low_index, high_index, probe)
+    probe.add_time("partition", time.perf_counter() - start)
+    probe.record_partition(partition_index - low_index + 1, high_index - partition_index)
+
+    swap_count_left = quicksort_probed(numbers, low_index, partition_index, probe, depth + 1, pivot_rule)
+    swap_count_right = quicksort_probed(numbers, partition_index + 1, high_index, probe, depth + 1, pivot_rule)
+    return swap_count_pivot + swap_count_partition + swap_count_left + swap_count_right
+
+
+def quicksort(numbers: list[int | float], low_index: int, high_index: int, count: bool = True,
+              probe=None, pivot_rule: str = "Midpoint") -> int | None:
+    """
+    Sort a segment of the list using the quicksort algorithm and count the number of swaps.
+
+    Parameters
+    ----------
+    numbers : list
+        The list to be sorted (modified in-place)
+    low_index : int
+        The lower bound of the segment to be sorted
+    high_index : int
+        The upper bound of the segment to be sorted
+    count : bool
+        Count the swaps. With False, the sort runs `quicksort_uncounted`, which has no counter bookkeeping.
+    probe : instrumentation.Probe | None
+        Record comparisons, moves, recursion depth, partition balance and partition time into this probe.
+        The sort then runs `quicksort_probed`; without a probe no instrumentation code runs at all.
+    pivot_rule : str
+        How to choose the pivot of each segment: a key of `PIVOT_RULES`, i.e. "Midpoint", "Median of Three"
+        or "Ninther". Swapping a chosen pivot to the middle of its segment counts as a swap.
+
+    Returns
+    -------
+    int | None
+        The total number of swaps made during the sorting process, or None if `count` is False
+    """
+    if probe is not None:
+        return quicksort_probed(numbers, low_index, high_index, probe, pivot_rule=pivot_rule)
+    if not count:
+        quicksort_uncounted(numbers, low_index, high_index, pivot_rule)
+        return None
+    if len(numbers) == 0:
         ValueError("Invalid parameters.")
     # Our base case is where the partition size is 1 or zero elements
     if low_index >= high_index:
         return 0
 
+    swap_count_pivot = 0 if pivot_rule == "Midpoint" else place_pivot(numbers, low_index, high_index, pivot_rule)
     partition_index, swap_count_partition = partition(numbers, low_index, high_index)
 
-    swap_count_left = quicksort(numbers, low_index, partition_index)
-    swap_count_right = quicksort(numbers, partition_index + 1, high_index)
-    return swap_count_partition + swap_count_left + swap_count_right
+    swap_count_left = quicksort(numbers, low_index, partition_index, pivot_rule=pivot_rule)
+    swap_count_right = quicksort(numbers, partition_index + 1, high_index, pivot_rule=pivot_rule)
+    return swap_count_pivot + swap_count_partition + swap_count_left + swap_count_right
 
 
 if __name__ == "__main__":
     test_one = [10, 2, 78, 4, 45, 32, 7, 11]
     quicksort(test_one, 0, len(test_one) - 1)
-    assert test_one == [2, 4, 7, 10, 11, 32, 45, 78]
\ No newline at end of file
+    assert test_one == [2, 4, 7, 10, 11, 32, 45, 78]
+
+    test_two = [10, 2, 78, 4, 45, 32, 7, 11]
+    assert quicksort(test_two, 0, len(test_two) - 1, count=False) is None
+    assert test_two == [2, 4, 7, 10, 11, 32, 45, 78]
+
+    import random
+    for test_rule in PIVOT_RULES:
+        for test_size in (0, 1, 2, 3, 8, 9, 10, 100, 1000):
+            test_numbers = [random.randint(0, test_size) for _ in range(test_size)]
+            for test_count in (True, False):
+                test_copy = list(test_numbers)
+                quicksort(test_copy, 0, test_size - 1, count=test_count, pivot_rule=test_rule)
+                assert test_copy == sorted(test_numbers)
+
+    # Test that the probe counts every comparison, including those that choose the pivot
+    from instrumentation import Probe
+
+    class CountedValue:
+        comparisons = 0
+
+        def __init__(self, value):
+            self.value = value
+
+        def __lt__(self, other):
+            CountedValue.comparisons += 1
+            return self.value < other.value
+
+    for test_rule in PIVOT_RULES:
+        test_values = [CountedValue(random.randint(0, 500)) for _ in range(500)]
+        test_probe = Probe()
+        CountedValue.comparisons = 0
+        quicksort(test_values, 0, len(test_values) - 1, probe=test_probe, pivot_rule=test_rule)
+        assert test_probe.comparisons == CountedValue.comparisons > 0
\ No newline at end of file
@@ -0,0 +1,122 @@
+"""
+Counting sort and LSD radix sort for bounded integers.
+
+Most datasets in datasets.py are integers in a small known range, which a comparison sort cannot take
+advantage of. Both sorts here run as a handful of vectorized NumPy passes over the data, in O(n + k) for
+counting sort (k being the value range) and O(n * w / 8) for radix sort (w being the bit width of the range):
+
+    counting_sort  counts every value with `np.bincount` and writes each value out as often as it was counted.
+                   It falls back to radix sort when the value range is much wider than the input.
+    radix_sort     sorts the values offset by the minimum one byte at a time, least significant byte first,
+                   each pass a stable argsort of the uint8 digits.
+
+Both sort the list in-place, like the other sorts, and fall back to quicksort for input that is not all
+integers (e.g. floats) or does not fit in 64 bits. Neither counts swaps: they never swap elements.
+"""
+import numpy as np
+
+from quicksort import quicksort
+
+RADIX_BITS = 8
+# Counting sort allocates one counter per value in the range; wider ranges go to radix sort
+COUNTING_RANGE_FACTOR = 4
+COUNTING_MIN_RANGE = 1 << 16
+
+
+def as_integer_array(numbers: list[int | float]) -> np.ndarray | None:
+    """
+    Convert `numbers` to an int64 array if every value is an integer that fits in 64 bits.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+
+    Returns
+    -------
+    np.ndarray | None
+        The values as int64, or None if they must be sorted with a comparison sort.
+    """
+    values = np.asarray(numbers)
+    if values.ndim != 1 or not np.issubdtype(values.dtype, np.integer):
+        return None
+    if values.dtype == np.uint64 and values.size and values.max() > np.iinfo(np.int64).max:
+        return None
+    return values.astype(np.int64, copy=False)
+
+
+def radix_sort_array(values: np.ndarray) -> np.ndarray:
+    """
+    Sort an int64 array with LSD radix sort.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        A non-empty int64 array.
+
+    Returns
+    -------
+    np.ndarray
+        The sorted values.
+    """
+    low = values.min()
+    # Offset by the minimum so the keys are non-negative; as uint64 the offset is exact even when the
+    # range exceeds the int64 range
+    keys = (values - low).view(np.uint64)
+    passes = -(-int(keys.max()).bit_length() // RADIX_BITS)
+    mask = np.uint64((1 << RADIX_BITS) - 1)
+    for digit in range(passes):
+        digits = ((keys >> np.uint64(digit * RADIX_BITS)) & mask).astype(np.uint8)
+        keys = keys[np.argsort(digits, kind="stable")]
+    return keys.view(np.int64) + low
+
+
+def radix_sort(numbers: list[int | float]) -> None:
+    """
+    Sort a list of integers in-place with LSD radix sort.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+        The list to be sorted (sorted in-place). Lists that are not all 64-bit integers are sorted with quicksort.
+    """
+    values = as_integer_array(numbers)
+    if values is None:
+        quicksort(numbers, 0, len(numbers) - 1, count=False)
+        return
+    if values.size:
+        numbers[:] = radix_sort_array(values).tolist()
+
+
+def counting_sort(numbers: list[int | float]) -> None:
+    """
+    Sort a list of integers in-place with counting sort.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+        The list to be sorted (sorted in-place). Lists whose value range is much wider than the list are
+        sorted with radix sort, and lists that are not all 64-bit integers with quicksort.
+    """
+    values = as_integer_array(numbers)
+    if values is None:
+        quicksort(numbers, 0, len(numbers) - 1, count=False)
+        return
+    if not values.size:
+        return
+    low, high = int(values.min()), int(values.max())
+    if high - low >= max(COUNTING_RANGE_FACTOR * values.size, COUNTING_MIN_RANGE):
+        numbers[:] = radix_sort_array(values).tolist()
+        return
+    counts = np.bincount(values - low)
+    numbers[:] = np.repeat(np.arange(low, high + 1, dtype=np.int64), counts).tolist()
+
+
+if __name__ == "__main__":
+    # Test counting sort and radix sort
+    for test_sort in (counting_sort, radix_sort):
+        for test_numbers in ([5, 3, 8, 1, 9, 2, 3], [-5, 2 ** 62, 0, -(2 ** 63), 2 ** 63 - 1, 7],
+                             [3.5, 1.25, 2.0], [2 ** 70, 1, 2 ** 65], [4, 4, 4], [], [1]):
+            expected = sorted(test_numbers)
+            test_sort(test_numbers)
+            assert test_numbers == expected, (test_sort.__name__, test_numbers)
+    print("All tests passed!")
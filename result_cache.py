@@ -0,0 +1,262 @@
+"""
+Content-addressed cache of benchmark cell results.
+
+A cell result is stored under a hash of everything that can change it:
+
+    - the source of the measurement function (e.g. `time_algorithm`) and of the algorithm runner, together with
+      the source files of every project module they reach, so editing quicksort.py invalidates only the cells
+      that run quicksort,
+    - the dataset contents, which cover the generator, its parameters, the seed and the size,
+    - the extra arguments of the cell (e.g. the repeat count),
+    - the Python and NumPy versions and the machine.
+
+Cached results are JSON files in the cache directory. Cells whose key is cached are not run again; a refresh
+recomputes every cell and overwrites its entry. Cancelled cells are never cached.
+"""
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import platform
+import sys
+import types
+
+from lazy_modules import lazy_import
+
+np = lazy_import("numpy")
+
+PROJECT_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+
+def hash_data(data) -> str:
+    """
+    Hash the contents of a dataset.
+
+    Parameters
+    ----------
+    data : list | np.ndarray
+        A list of numbers, or any other value with a stable repr (e.g. a list of lists).
+
+    Returns
+    -------
+    str
+        The hex digest.
+    """
+    digest = hashlib.sha256()
+    try:
+        values = np.asarray(data)
+    except ValueError:
+        values = None
+    if values is not None and values.dtype.kind in "biuf":
+        digest.update(f"{values.dtype.str}{values.shape}".encode())
+        digest.update(np.ascontiguousarray(values).tobytes())
+    else:
+        digest.update(repr(data).encode())
+    return digest.hexdigest()
+
+
+def _project_file(value) -> str | None:
+    """
+    Find the project source file that defines a function, class or module.
+
+    Parameters
+    ----------
+    value : object
+
+    Returns
+    -------
+    str | None
+        The path, or None for objects that are not defined in this project (e.g. the standard library).
+    """
+    if not isinstance(value, (types.FunctionType, type, types.ModuleType)):
+        return None
+    try:
+        path = inspect.getsourcefile(value)
+    except TypeError:
+        return None
+    if path is None or os.path.dirname(os.path.abspath(path)) != PROJECT_DIRECTORY:
+        return None
+    return os.path.abspath(path)
+
+
+def source_fingerprint(function) -> str:
+    """
+    Hash the source of a function and of everything in this project it reaches.
+
+    Functions defined in the same file as `function` are followed one by one through the globals they name and
+    the project modules they import locally, so editing one runner in benchmark.py does not invalidate the others.
+    Any other project module that is reached is hashed whole and followed through all of its globals.
+
+    Parameters
+    ----------
+    function : callable
+
+    Returns
+    -------
+    str
+        The hex digest.
+    """
+    home = _project_file(function)
+    digest = hashlib.sha256()
+    seen_functions = set()
+    seen_files = set()
+    pending = [function]
+    while pending:
+        value = pending.pop()
+        path = _project_file(value)
+        if path is None:
+            continue
+        if path == home and isinstance(value, types.FunctionType):
+            if value in seen_functions:
+                continue
+            seen_functions.add(value)
+            digest.update(inspect.getsource(value).encode())
+            for name in value.__code__.co_names:
+                if name in value.__globals__:
+                    pending.append(value.__globals__[name])
+                elif os.path.exists(os.path.join(PROJECT_DIRECTORY, f"{name}.py")):
+                    pending.append(importlib.import_module(name))
+        elif path != home and path not in seen_files:
+            seen_files.add(path)
+            module = next((module for module in list(sys.modules.values())
+                           if getattr(module, "__file__", None) and os.path.abspath(module.__file__) == path), None)
+            if module is not None:
+                pending.extend(vars(module).values())
+    for path in sorted(seen_files):
+        with open(path, "rb") as source:
+            digest.update(source.read())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    A directory of cached cell results, keyed by content hashes.
+
+    Parameters
+    ----------
+    directory : str
+        The cache directory. It is created when the first result is stored.
+    refresh : bool
+        Ignore the cached results and recompute (and overwrite) every cell.
+
+    Attributes
+    ----------
+    hits : int
+        The number of cell results read from the cache.
+    misses : int
+        The number of cell results that had to be computed.
+    """
+
+    def __init__(self, directory: str, refresh: bool = False):
+        self.directory = directory
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        self._fingerprints = {}
+
+    def _fingerprint(self, function) -> str:
+        if function not in self._fingerprints:
+            self._fingerprints[function] = source_fingerprint(function)
+        return self._fingerprints[function]
+
+    def key(self, function, algorithm: str, runners: tuple, data, arguments: tuple = ()) -> str:
+        """
+        Compute the cache key of a cell.
+
+        Parameters
+        ----------
+        function : callable
+            The measurement function of the cell, e.g. `benchmark.time_algorithm`.
+        algorithm : str
+            The algorithm name.
+        runners : tuple
+            The functions the algorithm name resolves to, e.g. `benchmark.run_quicksort` and
+            `benchmark.run_quicksort_probed`.
+        data : list
+            The dataset of the cell.
+        arguments : tuple
+            The extra arguments of the cell.
+
+        Returns
+        -------
+        str
+        """
+        parts = {
+            "Function": function.__name__,
+            "Function Source": self._fingerprint(function),
+            "Algorithm": algorithm,
+            "Algorithm Source": [self._fingerprint(runner) for runner in runners],
+            "Data": hash_data(data),
+            "Arguments": repr(arguments),
+            "Python": platform.python_version(),
+            "NumPy": np.__version__,
+            "Machine": platform.node(),
+        }
+        return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> dict | None:
+        """
+        Read a cached result.
+
+        Parameters
+        ----------
+        key : str
+
+        Returns
+        -------
+        dict | None
+            The result, or None if it is not cached or the cache is being refreshed.
+        """
+        if not self.refresh:
+            try:
+                with open(self._path(key)) as entry:
+                    result = json.load(entry)
+            except (OSError, ValueError):
+                pass
+            else:
+                self.hits += 1
+                return result
+        self.misses += 1
+        return None
+
+    def put(self, key: str, result: dict) -> None:
+        """
+        Store a result.
+
+        Parameters
+        ----------
+        key : str
+        result : dict
+            A JSON-serializable cell result.
+        """
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file first, so an interrupted run cannot leave a truncated entry
+        with open(f"{path}.tmp", "w") as entry:
+            json.dump(result, entry)
+        os.replace(f"{path}.tmp", path)
+
+
+if __name__ == "__main__":
+    # Test the cache keys and a store / reuse / refresh round trip
+    import tempfile
+
+    from benchmark import run_merge_sort, run_quicksort, time_algorithm
+
+    assert hash_data([3, 1, 2]) == hash_data([3, 1, 2]) != hash_data([3, 2, 1])
+    assert hash_data([1, 2]) != hash_data([1.0, 2.0]) and hash_data([[1], [2, 3]]) == hash_data([[1], [2, 3]])
+    assert source_fingerprint(run_quicksort) == source_fingerprint(run_quicksort) != source_fingerprint(run_merge_sort)
+    with tempfile.TemporaryDirectory() as test_directory:
+        test_cache = ResultCache(test_directory)
+        test_key = test_cache.key(time_algorithm, "QuickSort", (run_quicksort,), [3, 1, 2], (1,))
+        assert test_key != test_cache.key(time_algorithm, "QuickSort", (run_quicksort,), [3, 1, 2], (3,))
+        assert test_cache.get(test_key) is None
+        test_cache.put(test_key, {"Time (s)": 0.5, "Times": [0.5], "Swaps": 2})
+        assert test_cache.get(test_key) == {"Time (s)": 0.5, "Times": [0.5], "Swaps": 2}
+        assert ResultCache(test_directory, refresh=True).get(test_key) is None
+        assert (test_cache.hits, test_cache.misses) == (1, 1)
+    print("All tests passed!")
@@ -0,0 +1,330 @@
+"""
+Persistent results store with baseline comparison.
+
+Every benchmark run is saved in long (columnar) format: one row per table, dataset, size, metric and
+repeat, with the run metadata (machine, Python and NumPy versions, git commit, dataset seed) repeated on
+every row. A store is either a SQLite database (.db, .sqlite) or a CSV file (.csv), and new runs are
+appended to it.
+
+`compare_runs` compares a candidate run against a saved baseline. Timing metrics are flagged as a
+regression when the slowdown exceeds a threshold and is statistically significant under a one-sided
+permutation test over the repeats. The test needs at least three repeats in both runs to reach the default
+significance level of 0.05; with fewer, a warning is issued and slowdowns are flagged on the threshold alone.
+Memory metrics are flagged when their growth exceeds the threshold.
+"""
+import datetime
+import itertools
+import math
+import os
+import platform
+import sqlite3
+import subprocess
+import uuid
+import warnings
+
+import numpy as np
+import pandas as pd
+
+ID_COLUMNS = ["Dataset", "Algorithm", "Size", "Repeat"]
+COMPARISON_COLUMNS = ["Table", "Dataset", "Algorithm", "Size", "Metric", "Baseline", "Candidate", "Change (%)",
+                      "p-value", "Regression"]
+RESULTS_TABLE = "results"
+
+
+def collect_metadata(seed: int | None, label: str | None = None) -> dict:
+    """
+    Describe the environment of a benchmark run.
+
+    Parameters
+    ----------
+    seed : int | None
+        The seed the datasets were generated with.
+    label : str | None
+        A name for the run, e.g. "baseline".
+
+    Returns
+    -------
+    dict
+        The run id, label, timestamp, machine, Python/NumPy/pandas versions, git commit and seed.
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "Run": uuid.uuid4().hex[:12],
+        "Label": label,
+        "Timestamp": datetime.datetime.now().isoformat(timespec="microseconds"),
+        "Machine": platform.node(),
+        "Platform": platform.platform(),
+        "Processor": platform.processor() or platform.machine(),
+        "CPUs": os.cpu_count(),
+        "Python": platform.python_version(),
+        "NumPy": np.__version__,
+        "pandas": pd.__version__,
+        "Commit": commit,
+        "Seed": seed,
+    }
+
+
+def to_long(table: str, results: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert a wide result table into long format with one row per measurement.
+
+    Every numeric column other than the id columns (Dataset, Algorithm, Size, Repeat) becomes a metric.
+    Empty measurements (e.g. cancelled cells) are dropped.
+
+    Parameters
+    ----------
+    table : str
+        The name of the result table, e.g. "General".
+    results : pd.DataFrame
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns Table, Dataset, Algorithm, Size, Repeat, Metric and Value.
+    """
+    id_columns = [column for column in ID_COLUMNS if column in results.columns]
+    metrics = [column for column in results.columns if column not in id_columns
+               and pd.api.types.is_numeric_dtype(results[column])
+               and not pd.api.types.is_bool_dtype(results[column])]
+    long = results.melt(id_vars=id_columns, value_vars=metrics, var_name="Metric", value_name="Value")
+    long = long.dropna(subset=["Value"])
+    for column in ID_COLUMNS:
+        if column not in long.columns:
+            long[column] = 0 if column == "Repeat" else ""
+    long.insert(0, "Table", table)
+    long["Value"] = long["Value"].astype(float)
+    return long[["Table", *ID_COLUMNS, "Metric", "Value"]]
+
+
+def save_run(path: str, tables: dict[str, pd.DataFrame], metadata: dict) -> str:
+    """
+    Append the result tables of one run to the store at `path`.
+
+    Parameters
+    ----------
+    path : str
+        A .db/.sqlite or .csv file.
+    tables : dict[str, pd.DataFrame]
+        The wide result tables by name.
+    metadata : dict
+        The run metadata from `collect_metadata`.
+
+    Returns
+    -------
+    str
+        The run id.
+    """
+    long = pd.concat([to_long(table, results) for table, results in tables.items()], ignore_index=True)
+    for column, value in metadata.items():
+        long[column] = value
+    if path.endswith(".csv"):
+        long.to_csv(path, mode="a", header=not os.path.exists(path), index=False)
+    else:
+        with sqlite3.connect(path) as connection:
+            long.to_sql(RESULTS_TABLE, connection, if_exists="append", index=False)
+    return metadata["Run"]
+
+
+def load_results(path: str) -> pd.DataFrame:
+    """
+    Load every run saved in the store at `path`.
+
+    Parameters
+    ----------
+    path : str
+
+    Returns
+    -------
+    pd.DataFrame
+    """
+    if path.endswith(".csv"):
+        return pd.read_csv(path, dtype={"Dataset": str, "Algorithm": str, "Label": str}, keep_default_na=False,
+                           na_values={"Label": [""]})
+    with sqlite3.connect(path) as connection:
+        return pd.read_sql(f"SELECT * FROM {RESULTS_TABLE}", connection)
+
+
+def select_run(results: pd.DataFrame, run: str | None) -> pd.DataFrame:
+    """
+    Select the rows of one run by run id or label. The latest run is selected if `run` is None.
+
+    If several runs share a label, the latest of them is selected.
+
+    Parameters
+    ----------
+    results : pd.DataFrame
+    run : str | None
+
+    Returns
+    -------
+    pd.DataFrame
+    """
+    if run is not None:
+        results = results[(results["Run"] == run) | (results["Label"] == run)]
+    if results.empty:
+        raise ValueError(f"No saved run matches {run!r}.")
+    latest = results.sort_values("Timestamp")["Run"].iloc[-1]
+    return results[results["Run"] == latest]
+
+
+def permutation_p_value(baseline: np.ndarray, candidate: np.ndarray, permutations: int = 10000) -> float:
+    """
+    One-sided permutation test of the hypothesis that `candidate` has a larger mean than `baseline`.
+
+    All relabellings are enumerated when there are few of them, which gives the exact p-value; otherwise
+    `permutations` random ones are drawn and the observed labelling is counted among them.
+
+    Parameters
+    ----------
+    baseline : np.ndarray
+    candidate : np.ndarray
+    permutations : int
+
+    Returns
+    -------
+    float
+        The p-value, or NaN if either sample has fewer than two values.
+    """
+    if len(baseline) < 2 or len(candidate) < 2:
+        return float("nan")
+    pooled = np.concatenate([baseline, candidate])
+    observed = candidate.mean() - baseline.mean()
+    total = pooled.sum()
+    size = len(candidate)
+    if math.comb(len(pooled), size) <= permutations:
+        candidate_sums = np.array([pooled[list(chosen)].sum()
+                                   for chosen in itertools.combinations(range(len(pooled)), size)])
+        differences = candidate_sums / size - (total - candidate_sums) / len(baseline)
+        return float(np.mean(differences >= observed - 1e-12))
+    generator = np.random.default_rng(0)
+    candidate_sums = np.array([generator.permutation(pooled)[:size].sum() for _ in range(permutations)])
+    differences = candidate_sums / size - (total - candidate_sums) / len(baseline)
+    return float((np.sum(differences >= observed - 1e-12) + 1) / (permutations + 1))
+
+
+def minimum_p_value(baseline_count: int, candidate_count: int, permutations: int = 10000) -> float:
+    """
+    The smallest p-value `permutation_p_value` can return for samples of the given sizes.
+
+    Parameters
+    ----------
+    baseline_count : int
+    candidate_count : int
+    permutations : int
+
+    Returns
+    -------
+    float
+        1 over the number of relabellings (or over the random draws plus one), or NaN if either sample has fewer
+        than two values.
+    """
+    if baseline_count < 2 or candidate_count < 2:
+        return float("nan")
+    relabellings = math.comb(baseline_count + candidate_count, candidate_count)
+    return 1 / relabellings if relabellings <= permutations else 1 / (permutations + 1)
+
+
+def compare_runs(path: str, baseline: str, candidate: str | None = None, alpha: float = 0.05,
+                 threshold: float = 0.05) -> pd.DataFrame:
+    """
+    Compare a candidate run against a baseline run and flag regressions.
+
+    Parameters
+    ----------
+    path : str
+        The results store.
+    baseline : str
+        The run id or label of the baseline.
+    candidate : str | None
+        The run id or label of the candidate. Defaults to the latest run.
+    alpha : float
+        The significance level of the timing permutation test. Timing metrics with too few repeats for the test
+        to reach it (fewer than three per run at 0.05) are flagged on the threshold alone, with a warning.
+    threshold : float
+        The relative slowdown or memory growth (e.g. 0.05 for 5%) below which changes are ignored.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per compared time and memory metric with the baseline and candidate medians, the
+        relative change, the p-value and whether it is a regression. It has no rows, but the same columns,
+        if the runs share no metric.
+    """
+    results = load_results(path)
+    baseline_results = select_run(results, baseline)
+    candidate_results = select_run(results, candidate)
+    keys = ["Table", "Dataset", "Algorithm", "Size", "Metric"]
+    candidate_groups = dict(list(candidate_results.groupby(keys, sort=False, dropna=False)))
+
+    comparison = []
+    untestable = 0
+    for key, baseline_group in baseline_results.groupby(keys, sort=False, dropna=False):
+        metric = key[-1]
+        is_time = "Time (s)" in metric
+        is_memory = "(MB)" in metric or "Memory" in metric
+        if key not in candidate_groups or not (is_time or is_memory):
+            continue
+        baseline_values = baseline_group["Value"].to_numpy(dtype=float)
+        candidate_values = candidate_groups[key]["Value"].to_numpy(dtype=float)
+        baseline_median = float(np.median(baseline_values))
+        candidate_median = float(np.median(candidate_values))
+        change = candidate_median / baseline_median - 1 if baseline_median > 0 else float("nan")
+        if is_time:
+            p_value = permutation_p_value(baseline_values, candidate_values)
+            if not minimum_p_value(len(baseline_values), len(candidate_values)) <= alpha:
+                untestable += 1
+                regression = bool(change > threshold)
+            else:
+                regression = bool(change > threshold and p_value <= alpha)
+        else:
+            p_value = float("nan")
+            regression = bool(change > threshold)
+        comparison.append({
+            **dict(zip(keys, key)),
+            "Baseline": baseline_median,
+            "Candidate": candidate_median,
+            "Change (%)": 100 * change,
+            "p-value": p_value,
+            "Regression": regression,
+        })
+    if untestable:
+        warnings.warn(f"{untestable} timing metrics have too few repeats for a permutation test at alpha={alpha}; "
+                      f"they are flagged on the threshold alone. Save runs with --repeats 3 or more.", stacklevel=2)
+    return pd.DataFrame(comparison, columns=COMPARISON_COLUMNS).astype({"Regression": bool})
+
+
+if __name__ == "__main__":
+    # Test that a clear slowdown is flagged with three repeats, and a noisy one with two repeats only with a warning
+    import tempfile
+
+    assert permutation_p_value(np.array([1.0, 1.1, 0.9]), np.array([2.0, 2.1, 1.9])) == 0.05
+    assert minimum_p_value(3, 3) == 0.05 and minimum_p_value(2, 2) == 1 / 6 and math.isnan(minimum_p_value(1, 5))
+    assert 0 < permutation_p_value(np.arange(20.0), np.arange(20.0) + 100) < 1e-3
+
+    def test_run(label: str, times: list[float]) -> pd.DataFrame:
+        return pd.DataFrame({"Table": "Sorting", "Dataset": "Random", "Algorithm": "QuickSort", "Size": 1000,
+                             "Metric": "Time (s)", "Repeat": range(len(times)), "Value": times, "Run": label,
+                             "Label": label, "Timestamp": f"2026-01-0{len(label)}"})
+
+    with tempfile.TemporaryDirectory() as test_directory:
+        test_path = os.path.join(test_directory, "results.csv")
+        pd.concat([test_run("a", [1.0, 1.1, 0.9]), test_run("bb", [2.0, 2.1, 1.9]),
+                   test_run("ccc", [1.0, 1.1]), test_run("dddd", [2.0, 2.1])]).to_csv(test_path, index=False)
+        test_comparison = compare_runs(test_path, "a", "bb")
+        assert test_comparison["Regression"].tolist() == [True] and test_comparison["p-value"].iloc[0] == 0.05
+        assert not compare_runs(test_path, "a", "a")["Regression"].any()
+        with warnings.catch_warnings(record=True) as test_warnings:
+            warnings.simplefilter("always")
+            assert compare_runs(test_path, "ccc", "dddd")["Regression"].tolist() == [True]
+        assert len(test_warnings) == 1 and "too few repeats" in str(test_warnings[0].message)
+        # Runs that share no metric, e.g. a sweep and a suite, give an empty comparison with the usual columns
+        test_other = test_run("eeeee", [1.0, 1.1, 0.9]).assign(Table="Size Sweep")
+        pd.concat([pd.read_csv(test_path), test_other]).to_csv(test_path, index=False)
+        test_comparison = compare_runs(test_path, "a", "eeeee")
+        assert test_comparison.empty and list(test_comparison.columns) == COMPARISON_COLUMNS
+        assert test_comparison[test_comparison["Regression"]].empty
+    print("All tests passed!")
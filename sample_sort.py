@@ -0,0 +1,256 @@
+"""
+Sample sort across local worker processes.
+
+Sample sort splits an input too large for one process into buckets of disjoint value ranges, sorts every
+bucket on its own node, and concatenates the sorted buckets. Here the nodes are long-lived worker processes
+connected to the coordinator by pipes, standing in for machines, so the scaling of a multi-node sort can be
+measured on one host:
+
+1. Sample: draw `oversampling` values per node at random and pick the node count - 1 evenly spaced values
+   of the sorted sample as splitters. Oversampling keeps the buckets even when the values are skewed
+   (e.g. the front-heavy and end-heavy datasets).
+2. Partition: place every value in the range bucket between two splitters, or in the equality bucket of a
+   splitter it equals. Equality buckets are already sorted, so a heavily duplicated value cannot overload
+   one node.
+3. Scatter, sort and gather: send every range bucket to a node, sort it there with the chosen engine and
+   receive it back, in order.
+
+The report gives the bucket sizes, the load imbalance (the largest bucket over the mean bucket) and the time
+of every phase.
+"""
+import multiprocessing
+import time
+
+import numpy as np
+
+from adaptive_sort import ENGINES
+from parallel import stop_worker
+
+
+def _serve(connection) -> None:
+    """
+    Worker process entry point: sort the buckets sent by the coordinator until it sends None.
+
+    The worker first reports that it is ready. Every message is then (algorithm, buckets); the reply is
+    (True, [(sorted bucket, seconds), ...]) or (False, error message).
+
+    Parameters
+    ----------
+    connection : multiprocessing.connection.Connection
+        This worker's end of the duplex pipe to the coordinator.
+    """
+    connection.send((True, None))
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+        algorithm, buckets = message
+        try:
+            results = []
+            for bucket in buckets:
+                start = time.perf_counter()
+                ENGINES[algorithm](bucket)
+                results.append((bucket, time.perf_counter() - start))
+        except Exception as error:
+            connection.send((False, f"{type(error).__name__}: {error}"))
+        else:
+            connection.send((True, results))
+    connection.close()
+
+
+class SortWorkers:
+    """
+    A pool of long-lived worker processes that sort buckets, one pipe per worker.
+
+    Use as a context manager so the workers are stopped when done.
+
+    Parameters
+    ----------
+    count : int
+        The number of worker processes (nodes).
+    start_method : str
+        The multiprocessing start method.
+    """
+
+    def __init__(self, count: int, start_method: str = "spawn"):
+        context = multiprocessing.get_context(start_method)
+        self.connections = []
+        self.processes = []
+        for _ in range(count):
+            coordinator_end, worker_end = context.Pipe()
+            process = context.Process(target=_serve, args=(worker_end,), daemon=True)
+            process.start()
+            worker_end.close()
+            self.connections.append(coordinator_end)
+            self.processes.append(process)
+        # Wait until every worker has started, so start-up is not measured as transfer time
+        for connection in self.connections:
+            connection.recv()
+
+    def __len__(self):
+        return len(self.processes)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def sort_buckets(self, buckets: list[list], algorithm: str) -> list[tuple[list, float]]:
+        """
+        Sort the buckets on the workers, bucket i on worker i % len(self).
+
+        Every worker receives all of its buckets in one message, so no worker is left blocked sending its
+        result while the coordinator is still sending.
+
+        Parameters
+        ----------
+        buckets : list[list]
+        algorithm : str
+            A key of `adaptive_sort.ENGINES`.
+
+        Returns
+        -------
+        list[tuple[list, float]]
+            Every bucket sorted, in the order given, with the time the worker spent sorting it.
+        """
+        assigned = [list(range(worker, len(buckets), len(self))) for worker in range(len(self))]
+        for connection, indices in zip(self.connections, assigned):
+            connection.send((algorithm, [buckets[index] for index in indices]))
+        results = [None] * len(buckets)
+        for connection, indices in zip(self.connections, assigned):
+            succeeded, reply = connection.recv()
+            if not succeeded:
+                raise RuntimeError(f"Sample sort worker failed: {reply}")
+            for index, result in zip(indices, reply):
+                results[index] = result
+        return results
+
+    def close(self) -> None:
+        """
+        Stop the worker processes.
+        """
+        for connection, process in zip(self.connections, self.processes):
+            try:
+                connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            process.join(1)
+            if process.is_alive():
+                stop_worker(process)
+            connection.close()
+        self.connections = []
+        self.processes = []
+
+
+def choose_splitters(values: np.ndarray, nodes: int, oversampling: int, generator: np.random.Generator) -> np.ndarray:
+    """
+    Choose up to nodes - 1 distinct splitters from a random sample of the values.
+
+    Parameters
+    ----------
+    values : np.ndarray
+    nodes : int
+    oversampling : int
+        The number of sampled values per node.
+    generator : np.random.Generator
+
+    Returns
+    -------
+    np.ndarray
+        The splitters in increasing order. Duplicated splitters are merged, so heavily repeated values
+        give fewer, not empty, buckets.
+    """
+    if nodes < 2 or values.size == 0:
+        return values[:0]
+    sample = np.sort(generator.choice(values, size=nodes * oversampling))
+    return np.unique(sample[np.arange(1, nodes) * oversampling])
+
+
+def sample_sort(numbers: list[int | float], workers: SortWorkers | int = 4, algorithm: str = "QuickSort",
+                oversampling: int = 32, seed: int | None = None) -> tuple[list[int | float], dict]:
+    """
+    Sort `numbers` with sample sort on worker processes.
+
+    Parameters
+    ----------
+    numbers : list[int|float]
+        The values to sort. They are not modified.
+    workers : SortWorkers | int
+        A running worker pool to reuse across sorts, or the number of workers to start for this sort.
+    algorithm : str
+        The engine that sorts every bucket: a key of `adaptive_sort.ENGINES`, e.g. "QuickSort",
+        "MergeSort" or "Shell Sort".
+    oversampling : int
+        The number of sampled values per worker used to choose the splitters.
+    seed : int | None
+        The seed of the sample.
+
+    Returns
+    -------
+    tuple[list[int|float], dict]
+        The sorted values, and a report with the range and equality bucket sizes, the load imbalance
+        (largest range bucket / mean range bucket), the sort time of every bucket and the time of each phase.
+    """
+    if algorithm not in ENGINES:
+        raise ValueError(f"Unknown algorithm {algorithm!r}. Available engines: {', '.join(ENGINES)}")
+    if isinstance(workers, int):
+        with SortWorkers(workers) as pool:
+            return sample_sort(numbers, pool, algorithm, oversampling, seed)
+
+    start = time.perf_counter()
+    values = np.asarray(numbers)
+    splitters = choose_splitters(values, len(workers), oversampling, np.random.default_rng(seed))
+    sampled = time.perf_counter()
+
+    # Bucket 2i holds the values between splitters i - 1 and i, bucket 2i + 1 the values equal to splitter i
+    positions = np.searchsorted(splitters, values)
+    equal = np.zeros(values.size, dtype=bool)
+    inside = positions < splitters.size
+    equal[inside] = values[inside] == splitters[positions[inside]]
+    bucket_ids = 2 * positions + equal
+    order = np.argsort(bucket_ids, kind="stable")
+    counts = np.bincount(bucket_ids, minlength=2 * splitters.size + 1)
+    buckets = [bucket.tolist() for bucket in np.split(values[order], np.cumsum(counts)[:-1])]
+    partitioned = time.perf_counter()
+
+    sorted_ranges = workers.sort_buckets(buckets[::2], algorithm)
+    gathered = time.perf_counter()
+    result = []
+    for index, (bucket, _) in enumerate(sorted_ranges):
+        result.extend(bucket)
+        if 2 * index + 1 < len(buckets):
+            result.extend(buckets[2 * index + 1])
+    finished = time.perf_counter()
+
+    range_sizes = counts[::2].tolist()
+    bucket_times = [seconds for _, seconds in sorted_ranges]
+    mean_size = sum(range_sizes) / len(range_sizes)
+    return result, {
+        "Workers": len(workers),
+        "Range Bucket Sizes": range_sizes,
+        "Equality Bucket Sizes": counts[1::2].tolist(),
+        "Imbalance": max(range_sizes) / mean_size if mean_size else 1.0,
+        "Bucket Sort Times (s)": bucket_times,
+        "Sample Time (s)": sampled - start,
+        "Partition Time (s)": partitioned - sampled,
+        "Sort Time (s)": max(bucket_times),
+        "Transfer Time (s)": gathered - partitioned - max(bucket_times),
+        "Gather Time (s)": finished - gathered,
+        "Total Time (s)": finished - start,
+    }
+
+
+if __name__ == "__main__":
+    # Test sample sort on skewed and duplicated data
+    test_generator = np.random.default_rng(0)
+    with SortWorkers(3) as test_workers:
+        for test_numbers in (test_generator.integers(0, 1000, 5000).tolist(),
+                             test_generator.exponential(10, 5000).tolist(),
+                             [7] * 3000 + test_generator.integers(0, 10, 2000).tolist(),
+                             [], [4]):
+            for test_algorithm in ("QuickSort", "MergeSort", "Shell Sort"):
+                test_sorted, test_report = sample_sort(test_numbers, test_workers, test_algorithm, seed=1)
+                assert test_sorted == sorted(test_numbers)
+                assert sum(test_report["Range Bucket Sizes"]) + sum(test_report["Equality Bucket Sizes"]) == len(test_numbers)
+    print("All tests passed!")
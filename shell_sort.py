@@ -16,9 +16,7 @@ Sort to mimic this real-life scenario.
 
 """
 
-import numpy as np
 import time
-import pandas as pd
 
 # Generate gap sequence
 def generate_gap_values(arrSize):
@@ -40,10 +38,51 @@ def insertion_sort_interleaved(arr, start_index, gap_value):
             j = j - gap_value
     return swaps
 
+# Modified insertion sort for Shell Sort, without swap counting
+def insertion_sort_interleaved_uncounted(arr, start_index, gap_value):
+    for i in range(start_index + gap_value, len(arr), gap_value):
+        j = i
+        while (j - gap_value >= start_index) and (arr[j] < arr[j - gap_value]):
+            arr[j], arr[j - gap_value] = arr[j - gap_value], arr[j]
+            j = j - gap_value
+
+# Modified insertion sort for Shell Sort, recording comparisons and moves in the probe
+def insertion_sort_interleaved_probed(arr, start_index, gap_value, probe):
+    swaps = 0
+    comparisons = 0
+    for i in range(start_index + gap_value, len(arr), gap_value):
+        j = i
+        while j - gap_value >= start_index:
+            comparisons += 1
+            if not arr[j] < arr[j - gap_value]:
+                break
+            swaps += 1
+            arr[j], arr[j - gap_value] = arr[j - gap_value], arr[j]
+            j = j - gap_value
+    probe.comparisons += comparisons
+    probe.moves += 2 * swaps
+    return swaps
+
 # Shell Sort using insertion sort with gaps
-def shell_sort(arr):
+# With count=False no swaps are counted and None is returned
+# With a probe (instrumentation.Probe) comparisons, moves and the time of each gap pass are recorded
+def shell_sort(arr, count=True, probe=None):
     arrSize = len(arr)
     gap_values = generate_gap_values(arrSize)
+    if probe is not None:
+        probe.enter(1)
+        swaps = []
+        for gap_value in gap_values:
+            start = time.perf_counter()
+            for i in range(gap_value):
+                swaps.append(insertion_sort_interleaved_probed(arr, i, gap_value, probe))
+            probe.add_time("gap pass", time.perf_counter() - start)
+        return swaps
+    if not count:
+        for gap_value in gap_values:
+            for i in range(gap_value):
+                insertion_sort_interleaved_uncounted(arr, i, gap_value)
+        return None
     swaps = []
     for gap_value in gap_values:
         for i in range(gap_value):
@@ -53,6 +92,8 @@ def shell_sort(arr):
 # Generate characteristic testing datasets
 def generate_structured_datasets(size):
     """Structured datasets for characteristic testing."""
+    import numpy as np
+
     half = size // 2
     return {
         "Random": np.random.randint(0, 1000, size),
@@ -73,6 +114,8 @@ def generate_structured_datasets(size):
 # Generate large scale random datasets
 def generate_large_random_dataset(size):
     """Single large random dataset for scalability testing."""
+    import numpy as np
+
     return {
         f"Large Random ({size:,})": np.random.randint(0, 1_000_000, size)
     }
@@ -80,6 +123,9 @@ def generate_large_random_dataset(size):
 
 # Main execution block
 if __name__ == "__main__":
+    import numpy as np
+    import pandas as pd
+
     results = []
     
     # Structured dataset size
@@ -126,6 +172,9 @@ if __name__ == "__main__":
 
 
 def time_sorting_algorithms(datasets):
+    import numpy as np
+    import pandas as pd
+
     results = []
 
     for name, data in datasets.items():
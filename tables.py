@@ -0,0 +1,206 @@
+"""
+Dependency-free result tables.
+
+The benchmark tables are collected as plain records, one dict per row. A `RecordTable` keeps the records and
+renders them as aligned text, CSV or JSON with the standard library alone, so a short benchmark run never
+imports pandas. `to_frame` converts a table to a pandas DataFrame where pandas is really needed, e.g. to join
+tables or to save them to the results store.
+"""
+import csv
+import io
+import json
+import math
+
+
+def is_missing(value) -> bool:
+    """
+    Check whether a cell is empty: None or NaN.
+
+    Parameters
+    ----------
+    value : object
+
+    Returns
+    -------
+    bool
+    """
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def format_cell(value, integer: bool = False) -> str:
+    """
+    Render a cell for the text table, the way pandas prints it.
+
+    Parameters
+    ----------
+    value : object
+    integer : bool
+        The column holds whole numbers with gaps, which are printed as <NA>.
+
+    Returns
+    -------
+    str
+    """
+    if is_missing(value):
+        return "<NA>" if integer else "NaN"
+    if isinstance(value, float) and not isinstance(value, bool):
+        if value == 0 or 1e-4 <= abs(value) < 1e12 or math.isinf(value):
+            return f"{value:.6f}"
+        return f"{value:.6e}"
+    return str(value)
+
+
+class RecordTable:
+    """
+    A table of records, one dict per row. Rows may lack columns, which are then empty.
+
+    Parameters
+    ----------
+    records : list[dict]
+    integer_columns : list[str]
+        Columns of whole numbers that may have empty cells (e.g. the swaps of a cancelled cell). `to_frame`
+        gives them pandas' nullable Int64 dtype, so they are not turned into floats.
+    """
+
+    def __init__(self, records: list[dict], integer_columns: list[str] = ()):
+        self.records = list(records)
+        self.integer_columns = list(integer_columns)
+
+    @property
+    def columns(self) -> list[str]:
+        """
+        The column names in the order they first appear.
+        """
+        return list(dict.fromkeys(key for record in self.records for key in record))
+
+    @property
+    def empty(self) -> bool:
+        return not self.records
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __str__(self):
+        return self.to_string()
+
+    def column(self, name: str) -> list:
+        """
+        The values of a column, None where a row lacks it.
+
+        Parameters
+        ----------
+        name : str
+
+        Returns
+        -------
+        list
+        """
+        return [record.get(name) for record in self.records]
+
+    def to_string(self, index: bool = True) -> str:
+        """
+        Render the table as right-aligned text columns.
+
+        Parameters
+        ----------
+        index : bool
+            Also print the row numbers.
+
+        Returns
+        -------
+        str
+        """
+        columns = self.columns
+        cells = [[format_cell(record.get(column), column in self.integer_columns) for column in columns]
+                 for record in self.records]
+        if index:
+            columns = ["", *columns]
+            cells = [[str(number), *row] for number, row in enumerate(cells)]
+        widths = [max(len(column), *(len(row[position]) for row in cells)) if cells else len(column)
+                  for position, column in enumerate(columns)]
+        lines = [" ".join(cell.rjust(width) for cell, width in zip(row, widths)) for row in [columns, *cells]]
+        return "\n".join(lines)
+
+    def to_csv(self, path: str | None = None, index: bool = False) -> str | None:
+        """
+        Render the table as CSV, with empty cells left blank.
+
+        Parameters
+        ----------
+        path : str | None
+            The file to write to. The CSV is returned if None.
+        index : bool
+            Also write the row numbers.
+
+        Returns
+        -------
+        str | None
+        """
+        columns = self.columns
+        output = io.StringIO()
+        writer = csv.writer(output, lineterminator="\n")
+        writer.writerow(["", *columns] if index else columns)
+        for number, record in enumerate(self.records):
+            row = ["" if is_missing(record.get(column)) else record[column] for column in columns]
+            writer.writerow([number, *row] if index else row)
+        if path is None:
+            return output.getvalue()
+        with open(path, "w", newline="") as file:
+            file.write(output.getvalue())
+        return None
+
+    def to_json(self, orient: str = "records", indent: int | None = None) -> str:
+        """
+        Render the table as a JSON list of records, with empty cells as null.
+
+        Parameters
+        ----------
+        orient : str
+            Only "records" is supported.
+        indent : int | None
+
+        Returns
+        -------
+        str
+        """
+        if orient != "records":
+            raise ValueError(f"RecordTable renders JSON records only, not {orient!r}.")
+        records = [{column: None if is_missing(record.get(column)) else record[column] for column in self.columns}
+                   for record in self.records]
+        return json.dumps(records, indent=indent)
+
+    def to_frame(self):
+        """
+        Convert the table to a pandas DataFrame.
+
+        Returns
+        -------
+        pd.DataFrame
+        """
+        import pandas as pd
+
+        frame = pd.DataFrame(self.records, columns=self.columns)
+        return frame.astype({column: "Int64" for column in self.integer_columns if column in frame})
+
+
+if __name__ == "__main__":
+    # Test the renderings of a table with gaps
+    test_table = RecordTable([{"Dataset": "Random", "Time (s)": 0.25, "Swaps": 12},
+                              {"Dataset": "Fractal", "Time (s)": float("nan"), "Timed Out": True}],
+                             integer_columns=["Swaps"])
+    assert test_table.columns == ["Dataset", "Time (s)", "Swaps", "Timed Out"] and len(test_table) == 2
+    assert test_table.to_string(index=False).splitlines() == [
+        "Dataset Time (s) Swaps Timed Out",
+        " Random 0.250000    12       NaN",
+        "Fractal      NaN  <NA>      True",
+    ]
+    assert test_table.to_csv() == "Dataset,Time (s),Swaps,Timed Out\nRandom,0.25,12,\nFractal,,,True\n"
+    assert json.loads(test_table.to_json()) == [
+        {"Dataset": "Random", "Time (s)": 0.25, "Swaps": 12, "Timed Out": None},
+        {"Dataset": "Fractal", "Time (s)": None, "Swaps": None, "Timed Out": True},
+    ]
+    assert RecordTable([]).to_string(index=False) == "" and RecordTable([]).empty
+    print("All tests passed!")